@@ -0,0 +1,77 @@
+'''
+Compare write throughput of threads sharing one lock-guarded sack against threads
+writing into a concurrent sack, for a growing number of threads
+
+    $ python benchmarks/contention.py [messages_per_thread]
+'''
+
+import sys
+from threading import Barrier, Lock, Thread
+from time import perf_counter
+from typing import Callable
+
+from mezages import Sack
+from mezages.concurrent import ConcurrentSack
+
+
+THREAD_COUNTS = [1, 2, 4, 8]
+
+
+def locked_sack_writer() -> Callable[[str, str], None]:
+    sack, lock = Sack(), Lock()
+
+    def write(summary: str, context_path: str) -> None:
+        with lock:
+            sack.add_messages([summary], context_path)
+
+    return write
+
+
+def concurrent_sack_writer() -> Callable[[str, str], None]:
+    sack = ConcurrentSack()
+
+    def write(summary: str, context_path: str) -> None:
+        sack.add_messages([summary], context_path)
+
+    return write
+
+
+def run(writer: Callable[[str, str], None], threads: int, count: int) -> float:
+    barrier = Barrier(threads + 1)
+
+    def produce(index: int) -> None:
+        context_path = f'worker_{index}'
+        barrier.wait()
+
+        for _ in range(count):
+            writer('Some message', context_path)
+
+    workers = [Thread(target=produce, args=(index,)) for index in range(threads)]
+
+    for worker in workers:
+        worker.start()
+
+    barrier.wait()
+    started = perf_counter()
+
+    for worker in workers:
+        worker.join()
+
+    return threads * count / (perf_counter() - started)
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    for threads in THREAD_COUNTS:
+        locked = run(locked_sack_writer(), threads, count)
+        concurrent = run(concurrent_sack_writer(), threads, count)
+
+        print(
+            f'{threads:>2} threads: locked {locked / 1e3:8.1f}k msg/s'
+            f'  concurrent {concurrent / 1e3:8.1f}k msg/s'
+        )
+
+
+if __name__ == '__main__':
+    main()
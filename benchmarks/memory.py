@@ -0,0 +1,76 @@
+'''
+Compare the memory held by 1M messages stored as plain message dicts against the
+memory held by a sack storing the same messages as message records
+
+    $ python benchmarks/memory.py [count]
+'''
+
+import sys
+import tracemalloc
+from typing import Any, Callable
+
+from mezages import Sack
+from mezages.lib import build_message
+
+
+CONTEXT_PATHS = [f'data.field_{index}' for index in range(100)]
+
+
+def input_messages(count: int) -> list[tuple[str, Any]]:
+    return [
+        (
+            CONTEXT_PATHS[index % len(CONTEXT_PATHS)],
+            (
+                {'kind': 'failure', 'summary': f'Message {index}'}
+                if index % 4
+                else {'summary': f'Message {index}', 'description': f'Detail {index}'}
+            ),
+        )
+        for index in range(count)
+    ]
+
+
+def dict_storage(messages: list[tuple[str, Any]]) -> Any:
+    store: dict[str, dict[str, list[Any]]] = dict()
+
+    for context_path, input_message in messages:
+        message = build_message(context_path, input_message)
+        store.setdefault(context_path, dict())
+        store[context_path].setdefault(message['kind'], list())
+        store[context_path][message['kind']].append(message)
+
+    return store
+
+
+def sack_storage(messages: list[tuple[str, Any]]) -> Any:
+    sack = Sack()
+
+    for context_path, input_message in messages:
+        sack.add_messages([input_message], context_path)
+
+    return sack
+
+
+def measure(build: Callable[[list[tuple[str, Any]]], Any], count: int) -> int:
+    messages = input_messages(count)
+
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    storage = build(messages)
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    del storage
+    return current - baseline
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    for name, build in [('dict', dict_storage), ('sack', sack_storage)]:
+        used = measure(build, count)
+        print(f'{name:>6}: {used / 2**20:8.1f} MiB  {used / count:6.1f} B/message')
+
+
+if __name__ == '__main__':
+    main()
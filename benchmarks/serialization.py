@@ -0,0 +1,83 @@
+'''
+Compare the throughput and size of streaming a sack as json and binary against
+a plain json dump of its flat messages
+
+    $ python benchmarks/serialization.py [count]
+'''
+
+import sys
+from io import BytesIO
+from json import dumps, loads
+from time import perf_counter
+from typing import Any, Callable
+
+from mezages import Sack
+
+
+def build_sack(count: int) -> Sack:
+    sack = Sack()
+
+    sack.add_many(
+        (
+            f'data.items.field_{index % 500}',
+            [
+                (
+                    {'kind': 'failure', 'summary': f'Value {index} is not valid'}
+                    if index % 3
+                    else {'summary': f'Value {index} was trimmed', 'description': 'Info'}
+                )
+            ],
+        )
+        for index in range(count)
+    )
+
+    return sack
+
+
+def plain_json(sack: Sack) -> tuple[bytes, Callable[[], Any]]:
+    data = dumps([message.to_message() for message in sack.flat]).encode()
+
+    def deserialize() -> Sack:
+        loaded_sack = Sack()
+        loaded_sack.add_many(
+            ((message['ctx'], [message]) for message in loads(data)), trusted=True
+        )
+        return loaded_sack
+
+    return data, deserialize
+
+
+def streamed(format: str) -> Callable[[Sack], tuple[bytes, Callable[[], Any]]]:
+    def serialize(sack: Sack) -> tuple[bytes, Callable[[], Any]]:
+        fp = BytesIO()
+        sack.dump(fp, format)  # type: ignore
+        data = fp.getvalue()
+        return data, lambda: Sack.load(BytesIO(data))
+
+    return serialize
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    sack = build_sack(count)
+
+    for name, serialize in [
+        ('plain json', plain_json),
+        ('sack json', streamed('json')),
+        ('sack binary', streamed('binary')),
+    ]:
+        started = perf_counter()
+        data, deserialize = serialize(sack)
+        dumped = perf_counter()
+        deserialize()
+        loaded = perf_counter()
+
+        print(
+            f'{name:>12}: {len(data) / 2**20:7.1f} MiB'
+            f'  dump {count / (dumped - started) / 1e3:7.1f}k msg/s'
+            f'  load {count / (loaded - dumped) / 1e3:7.1f}k msg/s'
+        )
+
+
+if __name__ == '__main__':
+    main()
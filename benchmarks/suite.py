@@ -0,0 +1,268 @@
+'''
+Time and memory benchmarks of the sack hot paths, with json baselines and a
+regression gate
+
+    $ python benchmarks/suite.py --save benchmarks/baseline.json
+    $ python benchmarks/suite.py --compare benchmarks/baseline.json --threshold 0.25
+
+Exits with status 1 when any case is slower, or peaks higher in memory, than its
+baseline by more than the threshold
+'''
+
+import sys
+import json
+import tracemalloc
+from time import perf_counter
+from argparse import ArgumentParser
+from itertools import product
+from typing import Any, Callable, NamedTuple, Optional
+
+from mezages import Sack
+
+
+# -------------------------------------
+# CONSTANTS
+# -------------------------------------
+
+SIZES = [1_000, 10_000, 100_000, 1_000_000]
+
+QUICK_SIZES = [1_000, 10_000]
+
+FANOUTS = [1, 100, 10_000]
+
+MOUNT_DEPTHS = [1, 8]
+
+REPEATS = 3
+
+THRESHOLD = 0.25
+
+# -------------------------------------
+# CASES
+# -------------------------------------
+
+
+class Case(NamedTuple):
+    name: str
+    params: dict[str, int]
+    setup: Callable[[], Any]
+    run: Callable[[Any], Any]
+
+    @property
+    def key(self) -> str:
+        params = ','.join(f'{name}={value}' for name, value in self.params.items())
+        return f'{self.name}[{params}]'
+
+
+def context_messages(size: int, fanout: int) -> dict[str, list[Any]]:
+    contexts: dict[str, list[Any]] = {
+        f'data.field_{index}': list() for index in range(min(size, fanout))
+    }
+    context_paths = list(contexts)
+
+    for index in range(size):
+        contexts[context_paths[index % len(context_paths)]].append(
+            {'kind': 'failure', 'summary': f'Value {index} is invalid'}
+            if index % 2
+            else f'Value {index} was trimmed'
+        )
+
+    return contexts
+
+
+def filled_sack(size: int, fanout: int) -> Sack:
+    sack = Sack()
+    sack.add_many(context_messages(size, fanout))
+    return sack
+
+
+def add_messages(contexts: dict[str, list[Any]]) -> Sack:
+    sack = Sack()
+
+    for context_path, messages in contexts.items():
+        sack.add_messages(messages, context_path)
+
+    return sack
+
+
+def mount(sack_and_depth: tuple[Sack, int]) -> None:
+    sack, depth = sack_and_depth
+
+    for level in range(depth):
+        sack.mount(f'level_{level}')
+
+
+def merge(sacks: tuple[Sack, Sack]) -> None:
+    sacks[0].merge(sacks[1], 'other')
+
+
+def consuming_merge(sacks: tuple[Sack, Sack]) -> None:
+    sacks[0].merge(sacks[1], 'other', consume=True)
+
+
+def read_store(sack: Sack) -> int:
+    return sum(
+        len(bucket)
+        for context_view in sack.store.values()
+        for bucket in context_view.values()
+    )
+
+
+def cases(sizes: list[int]) -> list[Case]:
+    found: list[Case] = list()
+
+    for size, fanout in product(sizes, FANOUTS):
+        if fanout > size:
+            continue
+
+        params = {'size': size, 'fanout': fanout}
+
+        found += [
+            Case(
+                'add_messages',
+                params,
+                lambda size=size, fanout=fanout: context_messages(size, fanout),
+                add_messages,
+            ),
+            Case(
+                'merge',
+                params,
+                lambda size=size, fanout=fanout: (
+                    filled_sack(size, fanout),
+                    filled_sack(size, fanout),
+                ),
+                merge,
+            ),
+            Case(
+                'consuming_merge',
+                params,
+                lambda size=size, fanout=fanout: (
+                    filled_sack(size, fanout),
+                    filled_sack(size, fanout),
+                ),
+                consuming_merge,
+            ),
+            Case(
+                'store',
+                params,
+                lambda size=size, fanout=fanout: filled_sack(size, fanout),
+                read_store,
+            ),
+            Case(
+                'flat',
+                params,
+                lambda size=size, fanout=fanout: filled_sack(size, fanout),
+                lambda sack: sack.flat,
+            ),
+        ]
+
+        for depth in MOUNT_DEPTHS:
+            found.append(
+                Case(
+                    'mount',
+                    {**params, 'depth': depth},
+                    lambda size=size, fanout=fanout, depth=depth: (
+                        filled_sack(size, fanout),
+                        depth,
+                    ),
+                    mount,
+                )
+            )
+
+    return found
+
+
+# -------------------------------------
+# MEASUREMENT
+# -------------------------------------
+
+
+def measure(case: Case, repeats: int) -> dict[str, float]:
+    timings: list[float] = list()
+
+    for _ in range(repeats):
+        state = case.setup()
+        started = perf_counter()
+        case.run(state)
+        timings.append(perf_counter() - started)
+
+    state = case.setup()
+    tracemalloc.start()
+    case.run(state)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {'seconds': min(timings), 'peak_bytes': peak}
+
+
+def regressions(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    threshold: float,
+) -> list[str]:
+    found: list[str] = list()
+
+    for key, result in results.items():
+        expected = baseline.get(key)
+
+        if expected is None:
+            continue
+
+        for metric in ['seconds', 'peak_bytes']:
+            # [NOTE] Tiny values are dominated by noise, so they get an absolute floor
+            floor = 1e-4 if metric == 'seconds' else 64 * 1024
+            limit = max(expected[metric] * (1 + threshold), expected[metric] + floor)
+
+            if result[metric] > limit:
+                found.append(f'{key} {metric}: {result[metric]:.6g} > {limit:.6g}')
+
+    return found
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--sizes', help='comma separated message counts')
+    parser.add_argument('--quick', action='store_true', help=f'only sizes {QUICK_SIZES}')
+    parser.add_argument('--only', help='only run cases whose key contains this text')
+    parser.add_argument('--repeats', type=int, default=REPEATS)
+    parser.add_argument('--save', help='write the results to this json file')
+    parser.add_argument('--compare', help='compare the results to this json file')
+    parser.add_argument('--threshold', type=float, default=THRESHOLD)
+    args = parser.parse_args(argv)
+
+    sizes = (
+        [int(size) for size in args.sizes.split(',')]
+        if args.sizes
+        else QUICK_SIZES if args.quick else SIZES
+    )
+
+    results: dict[str, dict[str, float]] = dict()
+
+    for case in cases(sizes):
+        if args.only and args.only not in case.key:
+            continue
+
+        results[case.key] = result = measure(case, args.repeats)
+
+        print(
+            f'{case.key:<55} {result["seconds"] * 1e3:10.3f} ms'
+            f' {result["peak_bytes"] / 2**20:10.2f} MiB'
+        )
+
+    if args.save:
+        with open(args.save, 'w') as fp:
+            json.dump(results, fp, indent=2, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare) as fp:
+            found = regressions(results, json.load(fp), args.threshold)
+
+        for regression in found:
+            print(f'REGRESSION {regression}')
+
+        return 1 if found else 0
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
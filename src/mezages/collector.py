@@ -0,0 +1,147 @@
+from contextvars import ContextVar, Token
+from collections.abc import Iterable
+from typing import Any, Optional
+
+from mezages.sack import Sack
+from mezages.lib import (
+    ScopeError,
+    ContextCell,
+    InputMessage,
+    MessageRecord,
+    build_record,
+    prefix_context_path,
+    ensure_context_path,
+)
+
+
+class Scope:
+    '''
+    Collection scope bound to a context path
+
+    A root scope writes straight into its sack, while nested scopes buffer their
+    messages and fold them into the enclosing scope when they exit
+    '''
+
+    __slots__ = ('sack', 'parent', 'context_path', 'buffer', 'closed')
+
+    def __init__(self, sack: Sack, parent: Optional['Scope'], context_path: str) -> None:
+        self.sack = sack
+        self.parent = parent
+        self.context_path = context_path
+        self.buffer: dict[str, list[MessageRecord]] = dict()
+        self.closed = False
+
+    def resolve(self, context_path: Optional[str] = None) -> str:
+        return prefix_context_path(self.context_path, context_path)
+
+    def emit(
+        self, input_messages: Iterable[InputMessage], context_path: Optional[str] = None
+    ) -> None:
+        context_path = self.resolve(context_path)
+
+        if self.parent is None:
+            self.sack.add_messages(input_messages, context_path)
+            return None
+
+        # [NOTE] Records are built right away, so bad messages fail at the call site
+        cell = ContextCell(context_path)
+        records = [build_record(cell, input_message) for input_message in input_messages]
+
+        self.deposit(context_path, records)
+
+    def deposit(self, context_path: str, records: list[MessageRecord]) -> None:
+        if self.parent is None:
+            # [NOTE] Folded buffers interleave tasks, add_records sorts them by seq
+            self.sack.add_records(records, context_path)
+            return None
+
+        # [NOTE] Tasks that outlive their scope keep emitting into the enclosing one
+        if self.closed:
+            self.parent.deposit(context_path, records)
+            return None
+
+        buffered = self.buffer.get(context_path)
+
+        if buffered is None:
+            self.buffer[context_path] = records
+        else:
+            buffered.extend(records)
+
+    def fold(self) -> None:
+        buffer, self.buffer = self.buffer, dict()
+        self.closed = True
+
+        if self.parent is None:
+            return None
+
+        # [NOTE] Buffers move into the parent by reference, one list per context
+        for context_path, records in buffer.items():
+            self.parent.deposit(context_path, records)
+
+
+current_scope: ContextVar[Optional[Scope]] = ContextVar('mezages_scope', default=None)
+
+
+class Collector:
+    '''Sync and async context manager that opens a collection scope'''
+
+    def __init__(
+        self, context_path: Optional[str] = None, sack: Optional[Sack] = None
+    ) -> None:
+        self.context_path = context_path
+        self.sack = sack
+        self.scope: Optional[Scope] = None
+        self.token: Optional[Token[Optional[Scope]]] = None
+
+    def __enter__(self) -> Scope:
+        parent = current_scope.get()
+
+        if self.sack is not None or parent is None:
+            sack = Sack() if self.sack is None else self.sack
+            scope = Scope(sack, None, ensure_context_path(self.context_path))
+        else:
+            scope = Scope(parent.sack, parent, parent.resolve(self.context_path))
+
+        self.scope = scope
+        self.token = current_scope.set(scope)
+
+        return scope
+
+    def __exit__(self, *_: Any) -> None:
+        if self.scope is None or self.token is None:
+            return None
+
+        current_scope.reset(self.token)
+        self.scope.fold()
+        self.scope = self.token = None
+
+    async def __aenter__(self) -> Scope:
+        return self.__enter__()
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self.__exit__(*exc_info)
+
+
+def collect(
+    context_path: Optional[str] = None, sack: Optional[Sack] = None
+) -> Collector:
+    '''
+    Open a collection scope for the running task and any code nested in it
+
+        async with collect(sack=sack):
+            async with collect('data.user'):
+                emit(['Invalid email'], 'email')
+    '''
+
+    return Collector(context_path, sack)
+
+
+def emit(
+    input_messages: Iterable[InputMessage], context_path: Optional[str] = None
+) -> None:
+    scope = current_scope.get()
+
+    if scope is None:
+        raise ScopeError('No message collection scope is active')
+
+    scope.emit(input_messages, context_path)
@@ -0,0 +1,92 @@
+from threading import Lock, local
+from contextlib import ExitStack, contextmanager
+from collections.abc import Generator, Iterable
+from typing import Optional
+
+from mezages.lib import InputMessage
+from mezages.sack import Sack, ContextMessages
+
+
+class Shard:
+    __slots__ = ('lock', 'sack')
+
+    def __init__(self) -> None:
+        self.lock = Lock()
+        self.sack = Sack()
+
+
+class ConcurrentSack:
+    '''Sack that many threads can write to at once, each through its own shard'''
+
+    def __init__(self) -> None:
+        self.__lock = Lock()
+        self.__local = local()
+        self.__shards: list[Shard] = list()
+
+    def __len__(self) -> int:
+        with self.__locked_shards() as shards:
+            return sum(len(shard.sack) for shard in shards)
+
+    def add_messages(
+        self,
+        input_messages: Iterable[InputMessage],
+        context_path: Optional[str] = None,
+    ) -> None:
+        shard = self.__shard()
+
+        # [NOTE] Only readers ever compete with the owning thread for this lock
+        with shard.lock:
+            shard.sack.add_messages(input_messages, context_path)
+
+    def add_many(self, context_messages: ContextMessages, trusted: bool = False) -> None:
+        shard = self.__shard()
+
+        with shard.lock:
+            shard.sack.add_many(context_messages, trusted)
+
+    def merge(self, other: Sack, mount_context_path: Optional[str] = None) -> None:
+        shard = self.__shard()
+
+        with shard.lock:
+            shard.sack.merge(other, mount_context_path)
+
+    def collect(self) -> Sack:
+        sack = Sack()
+
+        with self.__locked_shards() as shards:
+            for shard in shards:
+                sack.merge(shard.sack)
+
+        return sack
+
+    def drain(self) -> Sack:
+        sack = Sack()
+
+        with self.__locked_shards() as shards:
+            for shard in shards:
+                sack.merge(shard.sack, consume=True)
+
+        return sack
+
+    def __shard(self) -> Shard:
+        shard: Optional[Shard] = getattr(self.__local, 'shard', None)
+
+        if shard is None:
+            shard = self.__local.shard = Shard()
+
+            with self.__lock:
+                self.__shards.append(shard)
+
+        return shard
+
+    @contextmanager
+    def __locked_shards(self) -> Generator[list[Shard], None, None]:
+        with self.__lock:
+            shards = list(self.__shards)
+
+        # [NOTE] Holding every shard lock at once gives readers a consistent view
+        with ExitStack() as stack:
+            for shard in shards:
+                stack.enter_context(shard.lock)
+
+            yield shards
@@ -0,0 +1,179 @@
+from sys import getsizeof
+from time import perf_counter
+from collections.abc import Callable, Iterable
+from typing import Any, Optional, cast
+
+from mezages.lib import InputMessage, MessageRecord
+from mezages.sack import Sack, ContextMessages
+
+
+# -------------------------------------
+# TYPE ALIASES
+# -------------------------------------
+
+Tracer = Callable[[str, float, int, Sack], None]
+
+# -------------------------------------
+# CONSTANTS
+# -------------------------------------
+
+OPERATIONS = ('add_messages', 'add_many', 'mount', 'merge', 'flat')
+
+POINTER_SIZE = 8
+
+# -------------------------------------
+# STATS
+# -------------------------------------
+
+
+class OperationStats:
+    __slots__ = ('calls', 'seconds', 'messages')
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.seconds = 0.0
+        # [NOTE] Net change in the number of messages held, over every call
+        self.messages = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {'calls': self.calls, 'seconds': self.seconds, 'messages': self.messages}
+
+
+class SackStats:
+    '''Call counters and cumulative timings of the operations of an instrumented sack'''
+
+    __slots__ = ('operations', 'tracer')
+
+    def __init__(self, tracer: Optional[Tracer] = None) -> None:
+        self.operations = {operation: OperationStats() for operation in OPERATIONS}
+        self.tracer = tracer
+
+    def record(self, operation: str, seconds: float, messages: int, sack: Sack) -> None:
+        stats = self.operations[operation]
+        stats.calls += 1
+        stats.seconds += seconds
+        stats.messages += messages
+
+        if self.tracer is not None:
+            self.tracer(operation, seconds, messages, sack)
+
+
+# -------------------------------------
+# INSTRUMENTED SACK
+# -------------------------------------
+
+
+class InstrumentedSack(Sack):
+    '''Sack that counts and times its operations, swapped in by instrument()'''
+
+    stats: SackStats
+
+    def __init__(
+        self,
+        max_per_context: Optional[int] = None,
+        max_per_kind: Optional[int] = None,
+        fold: bool = False,
+        tracer: Optional[Tracer] = None,
+    ) -> None:
+        super().__init__(max_per_context, max_per_kind, fold)
+        self.stats = SackStats(tracer)
+
+    @property
+    def flat(self) -> list[MessageRecord]:
+        started = perf_counter()
+
+        try:
+            return super().flat
+        finally:
+            self.stats.record('flat', perf_counter() - started, 0, self)
+
+    def mount(self, mount_context_path: str) -> None:
+        started = perf_counter()
+
+        try:
+            super().mount(mount_context_path)
+        finally:
+            self.stats.record('mount', perf_counter() - started, 0, self)
+
+    def add_messages(
+        self,
+        input_messages: Iterable[InputMessage],
+        context_path: Optional[str] = None,
+    ) -> None:
+        size, started = len(self), perf_counter()
+
+        try:
+            super().add_messages(input_messages, context_path)
+        finally:
+            self.stats.record(
+                'add_messages', perf_counter() - started, len(self) - size, self
+            )
+
+    def add_many(self, context_messages: ContextMessages, trusted: bool = False) -> None:
+        size, started = len(self), perf_counter()
+
+        try:
+            super().add_many(context_messages, trusted)
+        finally:
+            self.stats.record(
+                'add_many', perf_counter() - started, len(self) - size, self
+            )
+
+    def merge(
+        self,
+        other: Sack,
+        mount_context_path: Optional[str] = None,
+        consume: bool = False,
+    ) -> None:
+        size, started = len(self), perf_counter()
+
+        try:
+            super().merge(other, mount_context_path, consume)
+        finally:
+            self.stats.record('merge', perf_counter() - started, len(self) - size, self)
+
+    def report(self) -> dict[str, Any]:
+        return {
+            'operations': {
+                operation: stats.to_dict()
+                for operation, stats in self.stats.operations.items()
+            },
+            'messages': len(self),
+            'bytes': estimate_bytes(self),
+        }
+
+
+# -------------------------------------
+# FUNCTIONS
+# -------------------------------------
+
+
+def instrument(sack: Sack, tracer: Optional[Tracer] = None) -> SackStats:
+    # [NOTE] Swapping the class keeps plain sacks free of any instrumentation branches
+    if isinstance(sack, InstrumentedSack):
+        sack.stats.tracer = tracer
+        return sack.stats
+
+    if type(sack) is not Sack:
+        raise TypeError(f'Cannot instrument a {type(sack).__name__}')
+
+    sack.__class__ = InstrumentedSack
+    stats = cast(InstrumentedSack, sack).stats = SackStats(tracer)
+
+    return stats
+
+
+def uninstrument(sack: Sack) -> None:
+    if not isinstance(sack, InstrumentedSack):
+        return None
+
+    del sack.stats
+    cast(Sack, sack).__class__ = Sack
+
+
+def estimate_bytes(sack: Sack) -> int:
+    # [NOTE] Strings shared between records are counted once per record
+    return sum(
+        POINTER_SIZE + getsizeof(record) + getsizeof(record.summary)
+        for record in sack.iter()
+    )
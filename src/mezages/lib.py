@@ -1,5 +1,12 @@
 from re import compile
-from typing import Any, Literal, Optional, TypedDict, NotRequired
+from string import Formatter
+from functools import lru_cache
+from sys import intern
+from threading import Lock
+from itertools import count
+from collections import OrderedDict
+from collections.abc import Iterator, Mapping, Sequence
+from typing import Any, Literal, NamedTuple, Optional, TypedDict, NotRequired
 
 
 # -------------------------------------
@@ -20,12 +27,16 @@ Message = TypedDict(
 )
 
 
+TemplateParams = Mapping[str, Any] | Sequence[Any]
+
+
 InputMessageStruct = TypedDict(
     'InputMessageStruct',
     {
         'kind': NotRequired[Optional[Kind]],
         'summary': str,
         'description': NotRequired[Optional[str]],
+        'params': NotRequired[Optional[TemplateParams]],
     },
 )
 
@@ -38,10 +49,20 @@ InputMessage = str | InputMessageStruct
 
 GLOBAL_CONTEXT_PATH = 'global'
 
+KINDS: tuple[Kind, ...] = ('notice', 'warning', 'failure')
+
 CONTEXT_KEY_REGEX = '(?:(?:[a-z0-9]+_)*[a-z0-9]+)'
 
+CONTEXT_KEY_PATTERN = compile(CONTEXT_KEY_REGEX)
+
 CONTEXT_PATH_PATTERN = compile(fr'(?:{CONTEXT_KEY_REGEX}\.)*{CONTEXT_KEY_REGEX}')
 
+CONTEXT_PATH_CACHE_SIZE = 4096
+
+TEMPLATE_FIELDS_CACHE_SIZE = 1024
+
+FIELD_ACCESS_PATTERN = compile(r'[.\[]')
+
 # -------------------------------------
 # EXCEPTIONS
 # -------------------------------------
@@ -51,28 +72,398 @@ class ContextError(Exception):
     pass
 
 
+class ScopeError(Exception):
+    pass
+
+
+# -------------------------------------
+# CONTEXT PATH CACHE
+# -------------------------------------
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class ContextPathCache:
+    '''Bounded LRU of validated context paths, holding one interned string per path'''
+
+    def __init__(self, maxsize: int = CONTEXT_PATH_CACHE_SIZE) -> None:
+        self.__lock = Lock()
+        self.__paths: OrderedDict[str, str] = OrderedDict()
+        self.__evicting = False
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+
+    def validate(self, value: str) -> Optional[str]:
+        path = self.__paths.get(value)
+
+        if path is not None:
+            self.__hit(path)
+            return path
+
+        self.misses += 1
+
+        # [NOTE] A known valid prefix leaves only the last key to be matched
+        prefix, _, key = value.rpartition('.')
+
+        if prefix in self.__paths:
+            valid = CONTEXT_KEY_PATTERN.fullmatch(key) is not None
+        else:
+            valid = CONTEXT_PATH_PATTERN.fullmatch(value) is not None
+
+        return self.__remember(value) if valid else None
+
+    def extend(self, path: str, extension: str) -> Optional[str]:
+        value = f'{path}.{extension}'
+        known = self.__paths.get(value)
+
+        if known is not None:
+            self.__hit(known)
+            return known
+
+        self.misses += 1
+
+        # [NOTE] Only the joined path is remembered, bare extensions are never looked up
+        if CONTEXT_PATH_PATTERN.fullmatch(extension) is None:
+            return None
+
+        return self.__remember(value)
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self.__paths))
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__paths.clear()
+            self.__evicting = False
+            self.hits = self.misses = 0
+
+    def __hit(self, path: str) -> None:
+        self.hits += 1
+        self.__evicting = False
+
+        try:
+            self.__paths.move_to_end(path)
+        except KeyError:
+            pass
+
+    def __remember(self, value: str) -> str:
+        # [NOTE] A full cache without hits since its last eviction would only churn,
+        # so misses are left out until some path is looked up again
+        if self.__evicting and len(self.__paths) >= self.maxsize:
+            return value
+
+        path = intern(value)
+
+        with self.__lock:
+            self.__paths[path] = path
+
+            while len(self.__paths) > self.maxsize:
+                self.__paths.popitem(last=False)
+                self.__evicting = True
+
+        return path
+
+
+CONTEXT_PATH_CACHE = ContextPathCache()
+
+
 # -------------------------------------
 # FUNCTIONS
 # -------------------------------------
 
 
 def ensure_context_path(value: Any) -> str:
-    if value is None or (
-        isinstance(value, str) and CONTEXT_PATH_PATTERN.fullmatch(value)
-    ):
-        return value or GLOBAL_CONTEXT_PATH
+    if value is None:
+        return GLOBAL_CONTEXT_PATH
+
+    if isinstance(value, str) and (path := CONTEXT_PATH_CACHE.validate(value)):
+        return path
+
     raise ContextError(f'Invalid context path: {repr(value)}')
 
 
+def join_context_path(context_path: str, extension: Any) -> str:
+    '''Extend an already valid context path, only validating the extension'''
+
+    if isinstance(extension, str) and (
+        path := CONTEXT_PATH_CACHE.extend(context_path, extension)
+    ):
+        return path
+
+    raise ContextError(f'Invalid context path: {repr(extension)}')
+
+
+def rebase_context_path(prefix: str, context_path: str) -> str:
+    '''Resolve where mounting puts a context path, both paths being already valid'''
+
+    if context_path == GLOBAL_CONTEXT_PATH:
+        return prefix
+
+    if prefix == GLOBAL_CONTEXT_PATH:
+        return context_path
+
+    return f'{prefix}.{context_path}'
+
+
+def prefix_context_path(prefix: str, context_path: Optional[str] = None) -> str:
+    '''Resolve a context path to where mounting it on a valid prefix would put it'''
+
+    if context_path is None or context_path == GLOBAL_CONTEXT_PATH:
+        return prefix
+
+    if prefix == GLOBAL_CONTEXT_PATH:
+        return ensure_context_path(context_path)
+
+    return join_context_path(prefix, context_path)
+
+
+def context_path_cache_info() -> CacheInfo:
+    return CONTEXT_PATH_CACHE.info()
+
+
 def build_message(context_path: str, input_message: InputMessage) -> Message:
     if isinstance(input_message, str):
         input_message = {'summary': input_message}
 
+    summary, description = input_message['summary'], input_message.get('description')
+
+    if (params := input_message.get('params')) is not None:
+        summary = render_template(summary, params)
+
+        if description is not None:
+            description = render_template(description, params)
+
     return Message(
         {
             'ctx': context_path,
             'kind': input_message.get('kind') or 'notice',
-            'summary': input_message['summary'],
-            'description': input_message.get('description'),
+            'summary': summary,
+            'description': description,
         }
     )
+
+
+def render_template(template: str, params: TemplateParams) -> str:
+    if isinstance(params, Mapping):
+        return template.format_map(params)
+    return template.format(*params)
+
+
+def check_template(template: str, params: TemplateParams) -> None:
+    '''Raise like rendering would when the template refers to a missing param'''
+
+    mapping = isinstance(params, Mapping)
+
+    for field in template_fields(template):
+        if isinstance(field, int):
+            if mapping:
+                raise ValueError('Format string contains positional fields')
+            if field >= len(params):
+                raise IndexError(
+                    f'Replacement index {field} out of range for positional args tuple'
+                )
+        elif not mapping or field not in params:
+            raise KeyError(field)
+
+
+@lru_cache(maxsize=TEMPLATE_FIELDS_CACHE_SIZE)
+def template_fields(template: str) -> tuple[str | int, ...]:
+    fields: list[str | int] = list()
+    auto_index = 0
+
+    # [NOTE] Only the leading name of a field is looked up in the params
+    for _, field_name, _, _ in Formatter().parse(template):
+        if field_name is None:
+            continue
+
+        name = FIELD_ACCESS_PATTERN.split(field_name, 1)[0]
+
+        if not name:
+            fields.append(auto_index)
+            auto_index += 1
+        else:
+            fields.append(int(name) if name.isdigit() else name)
+
+    return tuple(fields)
+
+
+# -------------------------------------
+# RECORDS
+# -------------------------------------
+
+
+# [NOTE] Shared by every sack, so merged messages keep their emission order
+next_seq = count(1).__next__
+
+
+class Template:
+    '''Message text whose formatting is deferred until it is first read'''
+
+    __slots__ = ('text', 'params')
+
+    def __init__(self, text: str, params: TemplateParams) -> None:
+        self.text = text
+        # [NOTE] Copied, so later changes by the caller never reach the rendered text
+        self.params: TemplateParams = (
+            dict(params) if isinstance(params, Mapping) else tuple(params)
+        )
+
+        # [NOTE] Missing params fail here as they would when formatting right away
+        check_template(text, self.params)
+
+    def render(self) -> str:
+        return render_template(self.text, self.params)
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({self.text!r}, {self.params!r})'
+
+
+Text = str | Template
+
+
+class ContextCell:
+    '''Context path holder shared by every record stored under one context'''
+
+    __slots__ = ('path',)
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({self.path!r})'
+
+
+class MessageRecord(Mapping[str, Any]):
+    '''Immutable storage form of a message, readable like a message dict'''
+
+    __slots__ = ('_cell', '_kind', '_summary', '_seq')
+
+    KEYS = ('ctx', 'kind', 'summary', 'description')
+
+    def __init__(self, cell: ContextCell, kind: Kind, summary: Text, seq: int) -> None:
+        self._cell = cell
+        self._kind: Kind = kind
+        self._summary = summary
+        self._seq = seq
+
+    @property
+    def ctx(self) -> str:
+        # [NOTE] Resolved on read, so mounting only has to update the shared cell
+        return self._cell.path
+
+    @property
+    def kind(self) -> Kind:
+        return self._kind
+
+    @property
+    def summary(self) -> str:
+        summary = self._summary
+
+        # [NOTE] Templates are rendered once, then the text replaces them in the slot
+        if isinstance(summary, Template):
+            summary = self._summary = summary.render()
+
+        return summary
+
+    @property
+    def description(self) -> Optional[str]:
+        return None
+
+    @property
+    def seq(self) -> int:
+        return self._seq
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.KEYS)
+
+    def __len__(self) -> int:
+        return len(self.KEYS)
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({self.to_message()!r})'
+
+    def rebind(self, cell: ContextCell) -> 'MessageRecord':
+        description: Optional[Text] = getattr(self, '_description', None)
+        return make_record(cell, self._kind, self._summary, description, self._seq)
+
+    def to_message(self) -> Message:
+        return Message(
+            {
+                'ctx': self.ctx,
+                'kind': self.kind,
+                'summary': self.summary,
+                'description': self.description,
+            }
+        )
+
+
+class DescribedMessageRecord(MessageRecord):
+    '''Message record that also holds a description'''
+
+    __slots__ = ('_description',)
+
+    def __init__(
+        self, cell: ContextCell, kind: Kind, summary: Text, description: Text, seq: int
+    ) -> None:
+        super().__init__(cell, kind, summary, seq)
+        self._description = description
+
+    @property
+    def description(self) -> Optional[str]:
+        description = self._description
+
+        if isinstance(description, Template):
+            description = self._description = description.render()
+
+        return description
+
+
+def make_record(
+    cell: ContextCell,
+    kind: Kind,
+    summary: Text,
+    description: Optional[Text] = None,
+    seq: Optional[int] = None,
+) -> MessageRecord:
+    # [NOTE] Kinds are interned so records only ever point at a single shared string
+    kind = intern(kind)  # type: ignore
+
+    if seq is None:
+        seq = next_seq()
+
+    if description is None:
+        return MessageRecord(cell, kind, summary, seq)
+
+    return DescribedMessageRecord(cell, kind, summary, description, seq)
+
+
+def build_record(
+    context: ContextCell | str, input_message: InputMessage
+) -> MessageRecord:
+    if isinstance(context, str):
+        context = ContextCell(context)
+
+    if isinstance(input_message, str):
+        return MessageRecord(context, 'notice', input_message, next_seq())
+
+    summary: Text = input_message['summary']
+    description: Optional[Text] = input_message.get('description')
+
+    if (params := input_message.get('params')) is not None:
+        summary = Template(summary, params)
+        description = None if description is None else Template(description, params)
+
+    return make_record(
+        context, input_message.get('kind') or 'notice', summary, description
+    )
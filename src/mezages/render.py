@@ -0,0 +1,133 @@
+from abc import ABC, abstractmethod
+from collections.abc import Mapping
+from typing import Any, Generic, Optional, TypeVar
+
+from mezages.lib import Kind, MessageRecord
+from mezages.sack import Sack, ContextStamp
+from mezages.views import ContextView
+
+
+T = TypeVar('T')
+
+F = TypeVar('F')
+
+# -------------------------------------
+# FORMATTERS
+# -------------------------------------
+
+
+class Formatter(ABC, Generic[T, F]):
+    '''Renders single messages, then joins the rendered messages of a context'''
+
+    @abstractmethod
+    def format_message(self, record: MessageRecord) -> T:
+        # [NOTE] Should not depend on the ctx, only contexts are rendered per path
+        ...
+
+    @abstractmethod
+    def format_context(
+        self, context_path: str, rendered: Mapping[Kind, list[T]]
+    ) -> F: ...
+
+
+class TextFormatter(Formatter[str, str]):
+    def format_message(self, record: MessageRecord) -> str:
+        if record.description is None:
+            return record.summary
+        return f'{record.summary}: {record.description}'
+
+    def format_context(
+        self, context_path: str, rendered: Mapping[Kind, list[str]]
+    ) -> str:
+        return '\n'.join(
+            f'{context_path} [{kind}] {text}'
+            for kind, texts in rendered.items()
+            for text in texts
+        )
+
+
+class PayloadFormatter(Formatter[dict[str, Any], dict[str, Any]]):
+    def format_message(self, record: MessageRecord) -> dict[str, Any]:
+        return {'summary': record.summary, 'description': record.description}
+
+    def format_context(
+        self, context_path: str, rendered: Mapping[Kind, list[dict[str, Any]]]
+    ) -> dict[str, Any]:
+        return {
+            'ctx': context_path,
+            'messages': {kind: list(payloads) for kind, payloads in rendered.items()},
+        }
+
+
+# -------------------------------------
+# RENDERER
+# -------------------------------------
+
+
+class Fragment(Generic[T, F]):
+    __slots__ = ('stamp', 'rendered', 'value')
+
+    def __init__(
+        self, stamp: ContextStamp, rendered: dict[Kind, list[T]], value: F
+    ) -> None:
+        self.stamp = stamp
+        self.rendered = rendered
+        self.value = value
+
+
+class Renderer(Generic[T, F]):
+    '''Renders a sack context by context, reusing fragments of unchanged contexts'''
+
+    def __init__(self, sack: Sack, formatter: Formatter[T, F]) -> None:
+        self.sack = sack
+        self.formatter = formatter
+        self.__fragments: dict[str, Fragment[T, F]] = dict()
+
+    def render(self) -> dict[str, F]:
+        fragments: dict[str, Fragment[T, F]] = dict()
+        store = self.sack.store
+
+        for context_path, stamp in self.sack.stamps():
+            fragment = self.__fragments.get(context_path)
+
+            if fragment is None or fragment.stamp != stamp:
+                fragment = self.__refresh(
+                    context_path, stamp, store[context_path], fragment
+                )
+
+            fragments[context_path] = fragment
+
+        # [NOTE] Fragments of contexts that went away are dropped along with the old map
+        self.__fragments = fragments
+
+        return {
+            context_path: fragment.value for context_path, fragment in fragments.items()
+        }
+
+    def __refresh(
+        self,
+        context_path: str,
+        stamp: ContextStamp,
+        context_view: ContextView,
+        fragment: Optional[Fragment[T, F]],
+    ) -> Fragment[T, F]:
+        format_message = self.formatter.format_message
+
+        # [NOTE] Within an epoch buckets only grow, so only their new tails are rendered
+        rendered: dict[Kind, list[T]] = (
+            fragment.rendered
+            if fragment is not None and fragment.stamp[0] == stamp[0]
+            else dict()
+        )
+
+        for kind, bucket in context_view.items():
+            done = rendered.get(kind)
+
+            if done is None:
+                rendered[kind] = [format_message(record) for record in bucket]
+            elif len(done) < len(bucket):
+                done += [format_message(record) for record in bucket[len(done):]]
+
+        return Fragment(
+            stamp, rendered, self.formatter.format_context(context_path, rendered)
+        )
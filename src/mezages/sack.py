@@ -1,38 +1,667 @@
-from copy import deepcopy
-from itertools import chain
-from typing import Self, Optional, Sequence
+from hashlib import blake2b
+from heapq import merge as merge_sorted
+from itertools import count, islice
+from operator import attrgetter
+from types import MappingProxyType
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from typing import IO, Any, Self, Optional, cast
 
+from mezages.trie import TrieNode, ContextTrie
+from mezages.views import BucketView, StoreView
+from mezages.serial import (
+    Entry,
+    Format,
+    SerialError,
+    write_json,
+    write_binary,
+    read_buckets,
+)
 from mezages.lib import (
+    Kind,
     Message,
+    ContextCell,
     InputMessage,
-    build_message,
+    MessageRecord,
+    make_record,
+    build_record,
+    prefix_context_path,
+    rebase_context_path,
     ensure_context_path,
     GLOBAL_CONTEXT_PATH,
 )
 
 
-SackStore = dict[str, dict[str, list[Message]]]
+FoldKey = tuple[Kind, str, Optional[str]]
+
+Checkpoint = int
+
+ContextStamp = tuple[int, int]
+
+# [NOTE] Epochs are unique across sacks, so a stamp never matches another store
+next_epoch = count(1).__next__
+
+HASH_MASK = (1 << 64) - 1
+
+TREE_CHILDREN_KEY = 'contexts'
+
+
+class ContextStore(dict[Kind, list[MessageRecord]]):
+    '''Kind buckets of a single context along with the cells its records resolve to'''
+
+    __slots__ = (
+        'cell',
+        'cells',
+        'size',
+        'epoch',
+        'runs',
+        'occurrences',
+        'shared',
+        'digest',
+        'digested',
+        'term',
+    )
+
+    def __init__(self, context_path: str) -> None:
+        super().__init__()
+        self.cell = ContextCell(context_path)
+        self.cells = [self.cell]
+        self.size = 0
+        # [NOTE] Renewed on relocation, while buckets only grow within an epoch
+        self.epoch = next_epoch()
+        # [NOTE] Bucket offsets where another run of ascending seq values starts
+        self.runs: dict[Kind, list[int]] = dict()
+        # [NOTE] Occurrence counts of folded messages, only kept by folding sacks
+        self.occurrences: dict[FoldKey, int] = dict()
+        # [NOTE] Set once buckets and cells are shared with a store of another sack
+        self.shared = False
+        # [NOTE] Sum of message hashes, covering the first digested messages per kind
+        self.digest = 0
+        self.digested: Optional[dict[Kind, int]] = None
+        # [NOTE] What this store last added to the fingerprint of its sack
+        self.term = 0
+
+    def iter_runs(self, kind: Kind) -> Iterator[Iterator[MessageRecord]]:
+        bucket = self[kind]
+        starts = [0, *self.runs.get(kind, ())]
+        stops = [*starts[1:], len(bucket)]
+
+        for start, stop in zip(starts, stops):
+            yield islice(bucket, start, stop)
+
+    @property
+    def stamp(self) -> ContextStamp:
+        return self.epoch, self.size
+
+    def refresh_digest(self) -> int:
+        digest = self.digest
+        digested = self.digested
+
+        if digested is None:
+            digested = self.digested = dict()
+
+        # [NOTE] Buckets only grow, so only messages past the digested ones are hashed
+        for kind, bucket in self.items():
+            start = digested.get(kind, 0)
+
+            if start < len(bucket):
+                for record in islice(bucket, start, None):
+                    digest += stable_hash(*fold_key(record))
+                digested[kind] = len(bucket)
+
+        self.digest = digest & HASH_MASK
+
+        return self.digest
+
+    def share(self, kinds: Optional[tuple[Kind, ...]] = None) -> 'ContextStore':
+        shared = ContextStore(self.cell.path)
+        shared.cell, shared.cells = self.cell, list(self.cells)
+
+        for kind in self if kinds is None else kinds:
+            bucket = self.get(kind)
+
+            if not bucket:
+                continue
+
+            shared[kind] = bucket
+            shared.size += len(bucket)
+
+            if kind in self.runs:
+                shared.runs[kind] = self.runs[kind]
+
+        if kinds is None:
+            shared.digest = self.digest
+            shared.digested = None if self.digested is None else dict(self.digested)
+
+        shared.occurrences = (
+            self.occurrences
+            if kinds is None
+            else {
+                key: count
+                for key, count in self.occurrences.items()
+                if key[0] in kinds
+            }
+        )
+
+        if shared:
+            self.shared = shared.shared = True
+
+        return shared
+
+    def detach(self) -> None:
+        cell = ContextCell(self.cell.path)
+
+        for kind, bucket in self.items():
+            self[kind] = [record.rebind(cell) for record in bucket]
+
+        self.cell, self.cells = cell, [cell]
+        self.runs = {kind: list(runs) for kind, runs in self.runs.items()}
+        self.occurrences = dict(self.occurrences)
+        self.shared = False
+
+    def relocate(self, context_path: str) -> None:
+        # [NOTE] Shared cells would move the messages of the other sack as well
+        if self.shared:
+            self.detach()
+
+        for cell in self.cells:
+            cell.path = context_path
+
+        self.epoch = next_epoch()
+
+
+SackStore = dict[str, ContextStore]
+
+SackSnapshot = dict[str, dict[Kind, list[Message]]]
+
+# [NOTE] Limits of the sack, then how many messages it dropped by kind and folded
+PackedLimits = tuple[Optional[int], Optional[int], bool, dict[Kind, int], int]
+
+# [NOTE] Context index and kind, then per message data, sparse where mostly unset
+PackedBucket = tuple[
+    int, Kind, list[str], dict[int, Optional[str]], list[int], list[int], dict[int, int]
+]
+
+PackedSack = tuple[PackedLimits, tuple[str, ...], list[PackedBucket]]
+
+# [NOTE] None marks a remount, after which every message counts as changed
+LogEntry = Optional[tuple[ContextStore, Kind, int, int]]
+
+TreeBucket = tuple[tuple[str, ...], Kind, BucketView]
+
+# [NOTE] Kinds map to the rendered messages of a bucket, child contexts to subtrees
+Tree = dict[str, 'Tree | list[Any]']
+
+ContextPair = tuple[Optional[str], Iterable[InputMessage] | Iterable[Message]]
+
+ContextMessages = (
+    Mapping[Optional[str], Iterable[InputMessage] | Iterable[Message]]
+    | Iterable[ContextPair]
+)
 
 
 class Sack:
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        max_per_context: Optional[int] = None,
+        max_per_kind: Optional[int] = None,
+        fold: bool = False,
+    ) -> None:
         self.__store: SackStore = dict()
+        self.__trie: ContextTrie[ContextStore] = ContextTrie()
+        self.__counts: dict[Kind, int] = dict()
+        self.__size = 0
+
+        self.max_per_context = max_per_context
+        self.max_per_kind = max_per_kind
+        self.fold = fold
+        self.__bounded = fold or max_per_context is not None or max_per_kind is not None
+        self.__dropped: dict[Kind, int] = dict()
+        self.__folded = 0
+
+        # [NOTE] Only kept while checkpoints are in use, entries before sealed are final
+        self.__log: Optional[list[LogEntry]] = None
+        self.__sealed = 0
+        # [NOTE] Checkpoints count log entries from the first one, even the dropped ones
+        self.__log_start = 0
+        self.__checkpoints: dict[Checkpoint, int] = dict()
+
+        # [NOTE] Sum of context terms, refreshed for the changed contexts on read
+        self.__fingerprint = 0
+        self.__changed: dict[int, ContextStore] = dict()
+
+    def __len__(self) -> int:
+        return self.__size
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Sack):
+            return NotImplemented
+
+        if self is other:
+            return True
+
+        if len(self) != len(other) or self.fingerprint != other.fingerprint:
+            return False
+
+        if self.__store.keys() != other.__store.keys():
+            return False
+
+        for context_path, context_store in self.__store.items():
+            other_context_store = other.__store[context_path]
+
+            if context_store.keys() != other_context_store.keys():
+                return False
+
+            for kind, bucket in context_store.items():
+                other_bucket = other_context_store[kind]
+
+                if len(bucket) != len(other_bucket) or any(
+                    fold_key(record) != fold_key(other_record)
+                    for record, other_record in zip(bucket, other_bucket)
+                ):
+                    return False
+
+        return True
+
+    __hash__ = None  # type: ignore
+
+    @property
+    def fingerprint(self) -> int:
+        # [NOTE] Built on blake2b rather than the seeded builtin hash, so fingerprints
+        # match across processes and restarts and can key shared caches
+        fingerprint = self.__fingerprint
+
+        for context_store in self.__changed.values():
+            term = stable_hash(
+                context_store.cell.path, format(context_store.refresh_digest(), 'x')
+            )
+            fingerprint += term - context_store.term
+            context_store.term = term
+
+        self.__changed.clear()
+        self.__fingerprint = fingerprint & HASH_MASK
+
+        return self.__fingerprint
+
+    @property
+    def store(self) -> StoreView:
+        return StoreView(self.__store)
 
     @property
-    def store(self) -> SackStore:
-        return deepcopy(self.__store)
+    def counts(self) -> Mapping[Kind, int]:
+        return MappingProxyType(self.__counts)
 
     @property
-    def flat(self) -> list[Message]:
-        return list(
-            chain.from_iterable(
-                [
-                    bucket
-                    for context_store in self.store.values()
-                    for bucket in context_store.values()
-                ]
+    def dropped(self) -> Mapping[Kind, int]:
+        return MappingProxyType(self.__dropped)
+
+    @property
+    def folded(self) -> int:
+        return self.__folded
+
+    def stamps(self) -> Iterator[tuple[str, ContextStamp]]:
+        for context_path, context_store in self.__store.items():
+            yield context_path, context_store.stamp
+
+    def checkpoint(self) -> Checkpoint:
+        if self.__log is None:
+            self.__log = list()
+
+        self.__sealed = len(self.__log)
+        checkpoint = self.__log_start + self.__sealed
+        self.__checkpoints[checkpoint] = self.__checkpoints.get(checkpoint, 0) + 1
+
+        return checkpoint
+
+    def since(self, checkpoint: Checkpoint) -> Iterator[MessageRecord]:
+        if self.__log is None or checkpoint not in self.__checkpoints:
+            raise ValueError(f'Unknown sack checkpoint: {checkpoint!r}')
+
+        entries = self.__log[checkpoint - self.__log_start:]
+
+        if any(entry is None for entry in entries):
+            return self.iter()
+
+        return (
+            record
+            for context_store, kind, start, stop in cast(
+                list[tuple[ContextStore, Kind, int, int]], entries
             )
+            for record in islice(context_store[kind], start, stop)
+        )
+
+    def release(self, checkpoint: Checkpoint) -> None:
+        count = self.__checkpoints.get(checkpoint)
+
+        if self.__log is None or count is None:
+            raise ValueError(f'Unknown sack checkpoint: {checkpoint!r}')
+
+        if count > 1:
+            self.__checkpoints[checkpoint] = count - 1
+            return None
+
+        del self.__checkpoints[checkpoint]
+
+        # [NOTE] Without checkpoints in use, nothing is logged until the next one
+        if not self.__checkpoints:
+            self.__log_start += len(self.__log)
+            self.__log = None
+            self.__sealed = 0
+            return None
+
+        # [NOTE] Entries before the oldest checkpoint in use are never read again
+        dropped = min(self.__checkpoints) - self.__log_start
+
+        if dropped:
+            del self.__log[:dropped]
+            self.__log_start += dropped
+            self.__sealed -= dropped
+
+    def occurrences(self, message: Mapping[str, Any]) -> int:
+        context_store = self.__store.get(message['ctx'])
+
+        if context_store is None:
+            return 0
+
+        return context_store.occurrences.get(
+            (message['kind'], message['summary'], message['description']), 0
+        )
+
+    def has(self, kind: Kind) -> bool:
+        return self.__counts.get(kind, 0) > 0
+
+    def count(self, ctx: Optional[str] = None, kind: Optional[Kind] = None) -> int:
+        if ctx is None:
+            return self.__size if kind is None else self.__counts.get(kind, 0)
+
+        context_store = self.__store.get(ensure_context_path(ctx))
+
+        if context_store is None:
+            return 0
+
+        return context_store.size if kind is None else len(context_store.get(kind, ()))
+
+    @property
+    def flat(self) -> list[MessageRecord]:
+        # [NOTE] Holds read-only records, use to_messages() for plain serializable dicts
+        return list(self.iter())
+
+    def to_messages(self) -> list[Message]:
+        return [record.to_message() for record in self.iter()]
+
+    def snapshot(self) -> SackSnapshot:
+        return {
+            context_path: {
+                kind: [record.to_message() for record in bucket]
+                for kind, bucket in context_store.items()
+            }
+            for context_path, context_store in self.__store.items()
+        }
+
+    def iter(
+        self,
+        kinds: Optional[Iterable[Kind]] = None,
+        ctx: Optional[str] = None,
+        prefix: Optional[str] = None,
+    ) -> Iterator[MessageRecord]:
+        for _, _, bucket in self.__select_buckets(kinds, ctx, prefix):
+            yield from bucket
+
+    def iter_ordered(
+        self,
+        kinds: Optional[Iterable[Kind]] = None,
+        ctx: Optional[str] = None,
+        prefix: Optional[str] = None,
+    ) -> Iterator[MessageRecord]:
+        # [NOTE] Buckets hold ascending runs, so a k-way merge restores emission order
+        return merge_sorted(
+            *(
+                run
+                for context_store, kind, _ in self.__select_buckets(kinds, ctx, prefix)
+                for run in context_store.iter_runs(kind)
+            ),
+            key=attrgetter('seq'),
+        )
+
+    def first(
+        self,
+        kind: Optional[Kind] = None,
+        ctx: Optional[str] = None,
+        prefix: Optional[str] = None,
+    ) -> Optional[MessageRecord]:
+        kinds = None if kind is None else (kind,)
+        return next(self.iter(kinds, ctx, prefix), None)
+
+    def any(
+        self,
+        kind: Optional[Kind] = None,
+        ctx: Optional[str] = None,
+        prefix: Optional[str] = None,
+    ) -> bool:
+        if ctx is None and prefix is None:
+            return self.__size > 0 if kind is None else self.has(kind)
+
+        return self.first(kind, ctx, prefix) is not None
+
+    def under(
+        self, context_path: str, kinds: Optional[Iterable[Kind]] = None
+    ) -> Iterator[MessageRecord]:
+        return self.iter(kinds, prefix=context_path)
+
+    def count_under(
+        self, context_path: str, kinds: Optional[Iterable[Kind]] = None
+    ) -> int:
+        kinds = None if kinds is None else tuple(kinds)
+
+        return sum(
+            (
+                context_store.size
+                if kinds is None
+                else sum(len(context_store.get(kind, ())) for kind in kinds)
+            )
+            for context_store in self.__trie.values_under(
+                ensure_context_path(context_path)
+            )
+        )
+
+    def iter_tree(
+        self, depth: Optional[int] = None, kinds: Optional[Iterable[Kind]] = None
+    ) -> Iterator[TreeBucket]:
+        kinds = None if kinds is None else tuple(kinds)
+
+        # [NOTE] Walks the trie, so path segments are never split again
+        stack: list[tuple[TrieNode[ContextStore], tuple[str, ...]]] = [
+            (child, (child.key,))
+            for child in reversed(self.__trie.root.children.values())
+        ]
+
+        while stack:
+            node, keys = stack.pop()
+            context_store = node.value
+
+            if context_store is not None:
+                # [NOTE] Deeper contexts fold into their ancestor at the depth limit
+                tree_keys = keys if depth is None else keys[:depth]
+
+                for kind in context_store if kinds is None else kinds:
+                    bucket = context_store.get(kind)
+
+                    if bucket:
+                        yield tree_keys, kind, BucketView(bucket)
+
+            stack.extend(
+                (child, (*keys, child.key)) for child in reversed(node.children.values())
+            )
+
+    def to_tree(
+        self,
+        depth: Optional[int] = None,
+        kinds: Optional[Iterable[Kind]] = None,
+        render: Optional[Callable[[MessageRecord], Any]] = None,
+    ) -> Tree:
+        # [NOTE] Plain message dicts by default, so the tree serializes as it is
+        if render is None:
+            render = MessageRecord.to_message
+
+        tree: Tree = dict()
+
+        for keys, kind, bucket in self.iter_tree(depth, kinds):
+            node = tree_node(tree, keys[0])
+
+            # [NOTE] Child contexts sit under a key of their own, apart from the kinds
+            for key in keys[1:]:
+                node = tree_node(tree_node(node, TREE_CHILDREN_KEY), key)
+
+            leaf = node.get(kind)
+
+            if leaf is None:
+                leaf = node[kind] = list[Any]()
+
+            cast(list[Any], leaf).extend(render(record) for record in bucket)
+
+        return tree
+
+    def dump(self, fp: IO[bytes], format: Format = 'json') -> None:
+        if format == 'json':
+            write_json(fp, self.iter())
+        elif format == 'binary':
+            write_binary(
+                fp,
+                (
+                    (context_path, kind, bucket)
+                    for context_path, context_store in self.__store.items()
+                    for kind, bucket in context_store.items()
+                ),
+            )
+        else:
+            raise SerialError(f'Unknown sack format: {format!r}')
+
+    @classmethod
+    def load(cls, fp: IO[bytes], format: Optional[Format] = None) -> Self:
+        sack = cls()
+
+        for context_path, kind, entries in read_buckets(fp, format):
+            sack.__load_entries(ensure_context_path(context_path), kind, entries)
+
+        return sack
+
+    def pack(self) -> PackedSack:
+        limits = (
+            self.max_per_context,
+            self.max_per_kind,
+            self.fold,
+            dict(self.__dropped),
+            self.__folded,
         )
+        context_paths = tuple(self.__store)
+
+        return limits, context_paths, [
+            (
+                context_index,
+                kind,
+                [record.summary for record in bucket],
+                {
+                    index: record.description
+                    for index, record in enumerate(bucket)
+                    if record.description is not None
+                },
+                [record.seq for record in bucket],
+                list(context_store.runs.get(kind, ())),
+                (
+                    {
+                        index: context_store.occurrences[key]
+                        for index, key in enumerate(map(fold_key, bucket))
+                        if key in context_store.occurrences
+                    }
+                    if context_store.occurrences
+                    else {}
+                ),
+            )
+            for context_index, context_store in enumerate(self.__store.values())
+            for kind, bucket in context_store.items()
+        ]
+
+    @classmethod
+    def from_packed(cls, packed: PackedSack) -> Self:
+        limits, context_paths, buckets = packed
+        max_per_context, max_per_kind, fold, dropped, folded = limits
+
+        sack = cls(max_per_context, max_per_kind, fold)
+        sack.__dropped = dict(dropped)
+        sack.__folded = folded
+
+        for bucket in buckets:
+            context_index, kind, summaries, descriptions, seqs, runs, occurrences = bucket
+            context_store = sack.__writable_context_store(
+                ensure_context_path(context_paths[context_index])
+            )
+            cell = context_store.cell
+
+            # [NOTE] Seq values are kept, so emission order survives the round trip
+            records = [
+                make_record(cell, kind, summary, descriptions.get(index), seq)
+                for index, (summary, seq) in enumerate(zip(summaries, seqs, strict=True))
+            ]
+
+            for index, occurrence in occurrences.items():
+                context_store.occurrences[fold_key(records[index])] = occurrence
+
+            sack.__extend_bucket(context_store, kind, records, runs)
+
+        return sack
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # [NOTE] Pickles as flat lists of strings instead of nested dicts of records
+        return type(self).from_packed, (self.pack(),)
+
+    @classmethod
+    def gather(
+        cls,
+        sacks: Iterable['Sack'],
+        mount_paths: Optional[Iterable[Optional[str]]] = None,
+    ) -> Self:
+        '''Mount each sack on its path, then consume it, leaving every given sack empty'''
+
+        sacks = list(sacks)
+
+        if mount_paths is not None:
+            for sack, mount_path in zip(sacks, mount_paths, strict=True):
+                if mount_path is not None:
+                    sack.mount(mount_path)
+
+        # [NOTE] Consuming merges cost time per context, so folding in process is cheap
+        gathered = cls()
+
+        for sack in sacks:
+            gathered.merge(sack, consume=True)
+
+        return gathered
+
+    def select(
+        self, kinds: Optional[Iterable[Kind]] = None, prefix: Optional[str] = None
+    ) -> Self:
+        kinds = None if kinds is None else tuple(kinds)
+        sack = type(self)(self.max_per_context, self.max_per_kind, self.fold)
+
+        for context_store in self.__select_context_stores(None, prefix):
+            sack.__share(context_store, kinds)
+
+        return sack
+
+    def partition_by(self, depth: int = 1) -> dict[str, Self]:
+        partitions: dict[str, Self] = dict()
+
+        for context_path, context_store in self.__store.items():
+            key = '.'.join(context_path.split('.', depth)[:depth])
+            sack = partitions.get(key)
+
+            if sack is None:
+                sack = partitions[key] = type(self)(
+                    self.max_per_context, self.max_per_kind, self.fold
+                )
+
+            sack.__share(context_store)
+
+        return partitions
 
     def mount(self, mount_context_path: str) -> None:
         mount_context_path = ensure_context_path(mount_context_path)
@@ -43,44 +672,428 @@ class Sack:
         new_store: SackStore = dict()
 
         for context_path, context_store in self.__store.items():
-            new_context_path = (
-                mount_context_path
-                if context_path == GLOBAL_CONTEXT_PATH
-                else f'{mount_context_path}.{context_path}'
-            )
+            new_context_path = rebase_context_path(mount_context_path, context_path)
 
-            # [NOTE] Set messages context by reference
-            for message in chain(*context_store.values()):
-                message.update(ctx=new_context_path)
+            # [NOTE] Records resolve their ctx through these cells on read
+            context_store.relocate(new_context_path)
 
             new_store[new_context_path] = context_store
+            self.__changed[id(context_store)] = context_store
 
         self.__store = new_store
+        self.__trie.mount(mount_context_path, GLOBAL_CONTEXT_PATH)
+
+        if self.__log is not None:
+            self.__log.append(None)
+
+    def scope(self, context_path: str) -> 'SackScope':
+        return SackScope(self, ensure_context_path(context_path))
 
     def add_messages(
         self,
-        input_messages: Sequence[InputMessage],
+        input_messages: Iterable[InputMessage],
         context_path: Optional[str] = None,
     ) -> None:
-        context_path = ensure_context_path(context_path)
+        self.__ingest_messages(ensure_context_path(context_path), input_messages, False)
 
-        for input_message in input_messages:
-            message = build_message(context_path, input_message)
+    def add_many(
+        self,
+        context_messages: ContextMessages,
+        trusted: bool = False,
+    ) -> None:
+        for context_path, messages in context_pairs(context_messages):
+            self.__ingest_messages(ensure_context_path(context_path), messages, trusted)
 
-            self.__store.setdefault(context_path, dict())
-            self.__store[context_path].setdefault(message['kind'], list())
-            self.__store[context_path][message['kind']].append(message)
+    def add_records(
+        self, records: Iterable[MessageRecord], context_path: Optional[str] = None
+    ) -> None:
+        context_store = self.__writable_context_store(ensure_context_path(context_path))
+        cell = context_store.cell
+
+        # [NOTE] Records built elsewhere are rebound onto this sack, keeping their seq,
+        # and sorted by it so every bucket they extend stays one ascending run
+        self.__ingest(
+            context_store,
+            sorted((record.rebind(cell) for record in records), key=attrgetter('seq')),
+        )
 
-    def merge(self, other: Self, mount_context_path: Optional[str] = None) -> None:
-        for context_path, context_store in other.store.items():
+    def merge(
+        self,
+        other: 'Sack',
+        mount_context_path: Optional[str] = None,
+        consume: bool = False,
+    ) -> None:
+        mount_context_path = ensure_context_path(mount_context_path)
+
+        if other is self and consume:
+            raise ValueError('A sack cannot consume itself')
+
+        # [NOTE] A sack merging into itself would otherwise grow the store it walks
+        for context_path, other_context_store in list(other.__store.items()):
+            # [NOTE] Both paths are already valid, so they are joined as they are
             new_context_path = (
                 context_path
-                if mount_context_path in [None, GLOBAL_CONTEXT_PATH]
+                if mount_context_path == GLOBAL_CONTEXT_PATH
                 else f'{mount_context_path}.{context_path}'
             )
 
-            self.__store.setdefault(new_context_path, dict())
+            # [NOTE] Consuming hands buckets and cells over by reference
+            if (
+                consume
+                and not self.__bounded
+                and new_context_path not in self.__store
+            ):
+                other_context_store.relocate(new_context_path)
+                self.__add_context_store(new_context_path, other_context_store)
+
+                for kind, bucket in other_context_store.items():
+                    self.__count(kind, len(bucket))
+                    self.__log_extend(other_context_store, kind, 0, len(bucket))
+                continue
+
+            context_store = self.__writable_context_store(new_context_path)
+
+            # [NOTE] Bounded sacks admit merged messages one by one under their limits
+            if self.__bounded:
+                for bucket in list(other_context_store.values()):
+                    for record in list(bucket):
+                        self.__admit(
+                            context_store,
+                            record.rebind(context_store.cell),
+                            other_context_store.occurrences.get(fold_key(record), 1),
+                        )
+                continue
+
+            if consume:
+                other_context_store.relocate(new_context_path)
+                context_store.cells += other_context_store.cells
+
+                for kind, bucket in other_context_store.items():
+                    self.__extend_bucket(
+                        context_store, kind, bucket, other_context_store.runs.get(kind)
+                    )
+                continue
+
+            for kind, bucket in other_context_store.items():
+                self.__extend_bucket(
+                    context_store,
+                    kind,
+                    [record.rebind(context_store.cell) for record in bucket],
+                    other_context_store.runs.get(kind),
+                )
+
+        if consume:
+            other.__store = dict()
+            other.__counts = dict()
+            other.__size = 0
+            other.__fingerprint = 0
+            other.__changed = dict()
+            other.__trie = ContextTrie()
+
+            if other.__log is not None:
+                other.__log.append(None)
+
+    def __ingest_messages(
+        self,
+        context_path: str,
+        messages: Iterable[InputMessage] | Iterable[Message],
+        trusted: bool,
+    ) -> None:
+        context_store = self.__writable_context_store(context_path)
+        cell = context_store.cell
+
+        # [NOTE] Trusted messages are already shaped, so they skip normalization
+        records = (
+            (
+                make_record(
+                    cell, message['kind'], message['summary'], message['description']
+                )
+                for message in cast(Iterable[Message], messages)
+            )
+            if trusted
+            else (
+                build_record(cell, input_message)
+                for input_message in cast(Iterable[InputMessage], messages)
+            )
+        )
+
+        self.__ingest(context_store, records)
+
+    def __ingest(
+        self, context_store: ContextStore, records: Iterable[MessageRecord]
+    ) -> None:
+        if self.__bounded:
+            for record in records:
+                self.__admit(context_store, record)
+            return None
+
+        groups: dict[Kind, list[MessageRecord]] = dict()
+
+        for record in records:
+            group = groups.get(record.kind)
+
+            if group is None:
+                groups[record.kind] = [record]
+            else:
+                group.append(record)
+
+        for kind, group in groups.items():
+            self.__extend_bucket(context_store, kind, group)
+
+    def __admit(
+        self, context_store: ContextStore, record: MessageRecord, occurrences: int = 1
+    ) -> None:
+        kind = record.kind
+        key = fold_key(record) if self.fold else None
+
+        if key is not None and key in context_store.occurrences:
+            context_store.occurrences[key] += occurrences
+            self.__folded += occurrences
+            return None
+
+        if (
+            self.max_per_context is not None
+            and context_store.size >= self.max_per_context
+        ) or (
+            self.max_per_kind is not None
+            and self.__counts.get(kind, 0) >= self.max_per_kind
+        ):
+            self.__dropped[kind] = self.__dropped.get(kind, 0) + occurrences
+            return None
+
+        if key is not None:
+            context_store.occurrences[key] = occurrences
+
+        self.__extend_bucket(context_store, kind, [record])
+
+    def __load_entries(self, context_path: str, kind: Kind, entries: list[Entry]) -> None:
+        context_store = self.__writable_context_store(context_path)
+        cell = context_store.cell
 
-            for kind, messages in context_store.items():
-                self.__store[new_context_path].setdefault(kind, list())
-                self.__store[new_context_path][kind] += messages
+        self.__extend_bucket(
+            context_store,
+            kind,
+            [
+                make_record(cell, kind, summary, description)
+                for summary, description in entries
+            ],
+        )
+
+    def __extend_bucket(
+        self,
+        context_store: ContextStore,
+        kind: Kind,
+        records: list[MessageRecord],
+        runs: Optional[list[int]] = None,
+    ) -> None:
+        if not records:
+            return None
+
+        if not context_store:
+            self.__add_context_store(context_store.cell.path, context_store)
+
+        # [NOTE] The records list is owned by this sack from here on
+        bucket = context_store.get(kind)
+        offset = 0
+
+        if bucket is None:
+            context_store[kind] = records
+
+            if runs:
+                context_store.runs[kind] = list(runs)
+        else:
+            offset = len(bucket)
+            new_runs = [offset + start for start in runs or ()]
+
+            if records and records[0].seq < bucket[-1].seq:
+                new_runs.insert(0, offset)
+
+            if new_runs:
+                context_store.runs.setdefault(kind, list()).extend(new_runs)
+
+            bucket += records
+
+        context_store.size += len(records)
+        self.__changed[id(context_store)] = context_store
+        self.__count(kind, len(records))
+        self.__log_extend(context_store, kind, offset, offset + len(records))
+
+    def __log_extend(
+        self, context_store: ContextStore, kind: Kind, start: int, stop: int
+    ) -> None:
+        log = self.__log
+
+        if log is None or start == stop:
+            return None
+
+        last = log[-1] if len(log) > self.__sealed else None
+
+        # [NOTE] Consecutive additions to one bucket share a single entry
+        if (
+            last is not None
+            and last[0] is context_store
+            and last[1] == kind
+            and last[3] == start
+        ):
+            log[-1] = (context_store, kind, last[2], stop)
+        else:
+            log.append((context_store, kind, start, stop))
+
+    def __count(self, kind: Kind, count: int) -> None:
+        self.__counts[kind] = self.__counts.get(kind, 0) + count
+        self.__size += count
+
+    def __add_context_store(
+        self, context_path: str, context_store: Optional[ContextStore] = None
+    ) -> ContextStore:
+        if context_store is None:
+            context_store = ContextStore(context_path)
+
+        self.__store[context_path] = context_store
+        self.__trie.insert(context_path, context_store)
+
+        context_store.term = 0
+        self.__changed[id(context_store)] = context_store
+
+        return context_store
+
+    def __writable_context_store(self, context_path: str) -> ContextStore:
+        context_store = self.__store.get(context_path)
+
+        # [NOTE] New stores are only added to the sack along with their first record
+        if context_store is None:
+            return ContextStore(context_path)
+
+        # [NOTE] Stores shared with another sack are copied before their first write
+        if context_store.shared:
+            context_store.detach()
+
+        return context_store
+
+    def __share(
+        self, context_store: ContextStore, kinds: Optional[tuple[Kind, ...]] = None
+    ) -> None:
+        shared = context_store.share(kinds)
+
+        if not shared:
+            return None
+
+        self.__add_context_store(shared.cell.path, shared)
+
+        for kind, bucket in shared.items():
+            self.__count(kind, len(bucket))
+
+    def __select_buckets(
+        self,
+        kinds: Optional[Iterable[Kind]],
+        ctx: Optional[str],
+        prefix: Optional[str],
+    ) -> Iterator[tuple[ContextStore, Kind, list[MessageRecord]]]:
+        kinds = None if kinds is None else tuple(kinds)
+
+        for context_store in self.__select_context_stores(ctx, prefix):
+            if kinds is None:
+                for kind, bucket in context_store.items():
+                    yield context_store, kind, bucket
+                continue
+
+            for kind in kinds:
+                bucket = context_store.get(kind)
+
+                if bucket is not None:
+                    yield context_store, kind, bucket
+
+    def __select_context_stores(
+        self, ctx: Optional[str], prefix: Optional[str]
+    ) -> Iterable[ContextStore]:
+        # [NOTE] Validated up front, so a bad prefix raises whether or not ctx is given
+        prefix = None if prefix is None else ensure_context_path(prefix)
+
+        if ctx is not None:
+            ctx = ensure_context_path(ctx)
+            context_store = self.__store.get(ctx)
+
+            if context_store is None or (
+                prefix is not None
+                and ctx != prefix
+                and not ctx.startswith(f'{prefix}.')
+            ):
+                return ()
+
+            return (context_store,)
+
+        if prefix is not None:
+            return self.__trie.values_under(prefix)
+
+        return self.__store.values()
+
+
+def context_pairs(context_messages: ContextMessages) -> Iterable[ContextPair]:
+    if isinstance(context_messages, Mapping):
+        mapping = cast(
+            Mapping[Optional[str], Iterable[InputMessage] | Iterable[Message]],
+            context_messages,
+        )
+        return mapping.items()
+
+    return context_messages
+
+
+def tree_node(tree: Tree, key: str) -> Tree:
+    node = tree.get(key)
+
+    if node is None:
+        node = tree[key] = dict()
+
+    return cast(Tree, node)
+
+
+def stable_hash(*parts: Optional[str]) -> int:
+    digest = blake2b(digest_size=8)
+
+    # [NOTE] Parts are length prefixed and None is marked apart from any string
+    for part in parts:
+        if part is None:
+            digest.update(b'\x00')
+        else:
+            encoded = part.encode()
+            digest.update(b'\x01%d:' % len(encoded))
+            digest.update(encoded)
+
+    return int.from_bytes(digest.digest(), 'little')
+
+
+def fold_key(record: MessageRecord) -> FoldKey:
+    return record.kind, record.summary, record.description
+
+
+class SackScope:
+    '''Child view that writes straight into its sack under a validated prefix'''
+
+    __slots__ = ('sack', 'context_path')
+
+    def __init__(self, sack: Sack, context_path: str) -> None:
+        self.sack = sack
+        self.context_path = context_path
+
+    def scope(self, context_path: str) -> Self:
+        return type(self)(self.sack, prefix_context_path(self.context_path, context_path))
+
+    def resolve(self, context_path: Optional[str] = None) -> str:
+        return prefix_context_path(self.context_path, context_path)
+
+    def add_messages(
+        self,
+        input_messages: Iterable[InputMessage],
+        context_path: Optional[str] = None,
+    ) -> None:
+        self.sack.add_messages(input_messages, self.resolve(context_path))
+
+    def add_many(self, context_messages: ContextMessages, trusted: bool = False) -> None:
+        self.sack.add_many(
+            (
+                (self.resolve(context_path), messages)
+                for context_path, messages in context_pairs(context_messages)
+            ),
+            trusted,
+        )
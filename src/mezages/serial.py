@@ -0,0 +1,364 @@
+from json import dumps, loads
+from collections.abc import Iterable, Iterator, Sequence
+from typing import IO, Any, Literal, Optional, cast
+
+from mezages.lib import KINDS, Kind, MessageRecord
+
+
+# -------------------------------------
+# TYPE ALIASES
+# -------------------------------------
+
+Format = Literal['json'] | Literal['binary']
+
+Entry = tuple[str, Optional[str]]
+
+BucketEntries = tuple[str, Kind, list[Entry]]
+
+# -------------------------------------
+# CONSTANTS
+# -------------------------------------
+
+BINARY_MAGIC = b'MZG\x01'
+
+CHUNK_SIZE = 1 << 16
+
+BATCH_SIZE = 4096
+
+END_TAG = 0
+
+CONTEXT_TAG = 1
+
+KIND_TAG = 2
+
+BUCKET_TAG = 3
+
+# -------------------------------------
+# EXCEPTIONS
+# -------------------------------------
+
+
+class SerialError(Exception):
+    pass
+
+
+# -------------------------------------
+# JSON FORMAT
+# -------------------------------------
+
+
+def write_json(fp: IO[bytes], records: Iterable[MessageRecord]) -> None:
+    # [NOTE] One message per line keeps the output valid JSON and readable as a stream
+    separator = b'[\n'
+
+    for record in records:
+        fp.write(separator)
+        fp.write(dumps(record.to_message(), ensure_ascii=False).encode())
+        separator = b',\n'
+
+    fp.write(b'[]\n' if separator == b'[\n' else b'\n]\n')
+
+
+def read_json(fp: IO[bytes], head: bytes = b'') -> Iterator[BucketEntries]:
+    key: Optional[tuple[str, Kind]] = None
+    entries: list[Entry] = list()
+
+    for context_path, kind, entry in iter_json_messages(fp, head):
+        message_key = (context_path, kind)
+
+        if message_key != key or len(entries) >= BATCH_SIZE:
+            if key is not None:
+                yield (*key, entries)
+            key, entries = message_key, list()
+
+        entries.append(entry)
+
+    if key is not None:
+        yield (*key, entries)
+
+
+def iter_json_messages(
+    fp: IO[bytes], head: bytes = b''
+) -> Iterator[tuple[str, Kind, Entry]]:
+    lines = chain_lines(head, fp)
+    skipped: list[bytes] = list()
+
+    for line in lines:
+        skipped.append(line)
+        line = line.strip().rstrip(b',')
+
+        if line in (b'', b'[', b']', b'[]'):
+            continue
+
+        # [NOTE] Streams written by dump hold one message per line, others are
+        # read whole, such as compact or indented arrays
+        try:
+            message = loads(line)
+        except ValueError:
+            message = None
+
+        if not isinstance(message, dict):
+            break
+
+        yield parse_message(message)
+
+        for line in lines:
+            line = line.strip().rstrip(b',')
+
+            if line not in (b'', b']'):
+                yield parse_message(decode_json(line))
+
+        return None
+
+    messages = decode_json(b'\n'.join([*skipped, *lines]))
+
+    if not isinstance(messages, list):
+        raise SerialError('Expected a json array of sack messages')
+
+    for message in cast(list[Any], messages):
+        yield parse_message(message)
+
+
+def decode_json(value: bytes) -> Any:
+    try:
+        return loads(value)
+    except ValueError as error:
+        raise SerialError(f'Invalid json sack stream: {error}') from error
+
+
+def parse_message(message: Any) -> tuple[str, Kind, Entry]:
+    try:
+        context_path, kind, summary = message['ctx'], message['kind'], message['summary']
+        description = message.get('description')
+    except (AttributeError, KeyError, TypeError) as error:
+        raise SerialError(f'Invalid sack message: {message!r}') from error
+
+    if not (
+        isinstance(context_path, str)
+        and isinstance(summary, str)
+        and (description is None or isinstance(description, str))
+    ):
+        raise SerialError(f'Invalid sack message: {message!r}')
+
+    return context_path, ensure_kind(kind), (summary, description)
+
+
+def ensure_kind(value: Any) -> Kind:
+    if value not in KINDS:
+        raise SerialError(f'Unknown message kind: {value!r}')
+
+    return value
+
+
+def chain_lines(head: bytes, fp: IO[bytes]) -> Iterator[bytes]:
+    # [NOTE] The head bytes were read ahead to sniff the format and may span lines
+    yield from (head + fp.readline()).splitlines()
+    yield from fp
+
+
+# -------------------------------------
+# BINARY FORMAT
+# -------------------------------------
+
+
+def write_varint(fp: IO[bytes], value: int) -> None:
+    if value < 0x80:
+        fp.write(bytes((value,)))
+        return None
+
+    encoded = bytearray()
+
+    while value >= 0x80:
+        encoded.append((value & 0x7F) | 0x80)
+        value >>= 7
+
+    encoded.append(value)
+    fp.write(encoded)
+
+
+def write_text(fp: IO[bytes], value: str) -> None:
+    encoded = value.encode()
+    write_varint(fp, len(encoded))
+    fp.write(encoded)
+
+
+def write_entry(fp: IO[bytes], summary: str, description: Optional[str]) -> None:
+    write_text(fp, summary)
+
+    # [NOTE] A zero length marks a missing description, others are offset by one
+    if description is None:
+        fp.write(b'\x00')
+    else:
+        encoded = description.encode()
+        write_varint(fp, len(encoded) + 1)
+        fp.write(encoded)
+
+
+def write_binary(
+    fp: IO[bytes], buckets: Iterable[tuple[str, Kind, Sequence[MessageRecord]]]
+) -> None:
+    context_table: dict[str, int] = dict()
+    kind_table: dict[str, int] = dict()
+
+    fp.write(BINARY_MAGIC)
+
+    for context_path, kind, bucket in buckets:
+        # [NOTE] Contexts and kinds are written once, then referred to by index
+        if context_path not in context_table:
+            context_table[context_path] = len(context_table)
+            fp.write(bytes((CONTEXT_TAG,)))
+            write_text(fp, context_path)
+
+        if kind not in kind_table:
+            kind_table[kind] = len(kind_table)
+            fp.write(bytes((KIND_TAG,)))
+            write_text(fp, kind)
+
+        fp.write(bytes((BUCKET_TAG,)))
+        write_varint(fp, context_table[context_path])
+        write_varint(fp, kind_table[kind])
+        write_varint(fp, len(bucket))
+
+        for record in bucket:
+            write_entry(fp, record.summary, record.description)
+
+    fp.write(bytes((END_TAG,)))
+
+
+class BinaryReader:
+    '''Reads varints and length-prefixed strings from a stream, a chunk at a time'''
+
+    def __init__(self, fp: IO[bytes]) -> None:
+        self.fp = fp
+        self.buffer = b''
+        self.offset = 0
+
+    def fill(self, size: int) -> None:
+        remaining = self.buffer[self.offset:]
+
+        while len(remaining) < size:
+            chunk = self.fp.read(max(CHUNK_SIZE, size - len(remaining)))
+
+            if not chunk:
+                raise SerialError('Unexpected end of binary sack stream')
+
+            remaining += chunk
+
+        self.buffer, self.offset = remaining, 0
+
+    def read_byte(self) -> int:
+        if self.offset >= len(self.buffer):
+            self.fill(1)
+
+        value = self.buffer[self.offset]
+        self.offset += 1
+
+        return value
+
+    def read_varint(self) -> int:
+        value = self.read_byte()
+
+        if value < 0x80:
+            return value
+
+        value &= 0x7F
+        shift = 7
+
+        while True:
+            byte = self.read_byte()
+            value |= (byte & 0x7F) << shift
+
+            if byte < 0x80:
+                return value
+
+            shift += 7
+
+    def read_bytes(self, size: int) -> bytes:
+        if self.offset + size > len(self.buffer):
+            self.fill(size)
+
+        value = self.buffer[self.offset:self.offset + size]
+        self.offset += size
+
+        return value
+
+    def read_text(self) -> str:
+        return decode_text(self.read_bytes(self.read_varint()))
+
+    def read_entry(self) -> Entry:
+        summary = self.read_text()
+        size = self.read_varint()
+
+        return summary, decode_text(self.read_bytes(size - 1)) if size else None
+
+
+def decode_text(value: bytes) -> str:
+    try:
+        return value.decode()
+    except UnicodeDecodeError as error:
+        raise SerialError(f'Invalid text in binary sack stream: {error}') from error
+
+
+def read_binary(fp: IO[bytes]) -> Iterator[BucketEntries]:
+    reader = BinaryReader(fp)
+    context_table: list[str] = list()
+    kind_table: list[Kind] = list()
+
+    while True:
+        tag = reader.read_byte()
+
+        if tag == END_TAG:
+            return None
+
+        if tag == CONTEXT_TAG:
+            context_table.append(reader.read_text())
+            continue
+
+        if tag == KIND_TAG:
+            kind_table.append(ensure_kind(reader.read_text()))
+            continue
+
+        if tag != BUCKET_TAG:
+            raise SerialError(f'Unknown binary sack tag: {tag}')
+
+        try:
+            context_path = context_table[reader.read_varint()]
+            kind = kind_table[reader.read_varint()]
+        except IndexError as error:
+            raise SerialError('Unknown context or kind in binary sack stream') from error
+        entries: list[Entry] = list()
+
+        for _ in range(reader.read_varint()):
+            entries.append(reader.read_entry())
+
+            # [NOTE] Large buckets are handed over in batches to keep memory flat
+            if len(entries) >= BATCH_SIZE:
+                yield context_path, kind, entries
+                entries = list()
+
+        if entries:
+            yield context_path, kind, entries
+
+
+# -------------------------------------
+# FUNCTIONS
+# -------------------------------------
+
+
+def read_buckets(
+    fp: IO[bytes], format: Optional[Format] = None
+) -> Iterator[BucketEntries]:
+    if format == 'json':
+        return read_json(fp)
+
+    if format == 'binary':
+        if fp.read(len(BINARY_MAGIC)) != BINARY_MAGIC:
+            raise SerialError('Not a binary sack stream')
+        return read_binary(fp)
+
+    head = fp.read(len(BINARY_MAGIC))
+
+    if head == BINARY_MAGIC:
+        return read_binary(fp)
+
+    return read_json(fp, head)
@@ -0,0 +1,261 @@
+from io import SEEK_END, BytesIO
+from mmap import ACCESS_READ, mmap
+from itertools import groupby, islice
+from operator import itemgetter
+from tempfile import TemporaryFile
+from collections.abc import Iterable, Iterator, Mapping
+from typing import IO, Any, Self, TypeVar, Optional, cast
+
+from mezages.sack import Sack, ContextPair, ContextMessages, context_pairs
+from mezages.views import BucketView
+from mezages.serial import Entry, BinaryReader, write_entry
+from mezages.lib import (
+    Kind,
+    ContextCell,
+    InputMessage,
+    MessageRecord,
+    make_record,
+    rebase_context_path,
+    ensure_context_path,
+    GLOBAL_CONTEXT_PATH,
+)
+
+
+# -------------------------------------
+# TYPE ALIASES
+# -------------------------------------
+
+# [NOTE] Byte offset and size of a run of encoded messages, then how many it holds
+Segment = tuple[int, int, int]
+
+SpillBuckets = dict[Kind, list[Segment]]
+
+SpillIndex = dict[str, SpillBuckets]
+
+T = TypeVar('T')
+
+# -------------------------------------
+# CONSTANTS
+# -------------------------------------
+
+MEMORY_BUDGET = 100_000
+
+# -------------------------------------
+# SPILL SACK
+# -------------------------------------
+
+
+class SpillSack:
+    '''Sack that keeps recent messages in memory and spills older ones to a file'''
+
+    def __init__(
+        self, memory_budget: int = MEMORY_BUDGET, path: Optional[str] = None
+    ) -> None:
+        # [NOTE] The budget is the number of messages held in memory at most
+        self.memory_budget = memory_budget
+
+        self.__hot = Sack()
+        self.__index: SpillIndex = dict()
+        self.__counts: dict[Kind, int] = dict()
+        self.__size = 0
+        self.__file: IO[bytes] = TemporaryFile() if path is None else open(path, 'w+b')
+        self.__map: Optional[mmap] = None
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.__size + len(self.__hot)
+
+    @property
+    def spilled(self) -> int:
+        return self.__size
+
+    @property
+    def counts(self) -> Mapping[Kind, int]:
+        counts = dict(self.__counts)
+
+        for kind, count in self.__hot.counts.items():
+            counts[kind] = counts.get(kind, 0) + count
+
+        return counts
+
+    def count(self, ctx: Optional[str] = None, kind: Optional[Kind] = None) -> int:
+        if ctx is None:
+            if kind is None:
+                return len(self)
+            return self.__counts.get(kind, 0) + self.__hot.count(kind=kind)
+
+        spilled = self.__index.get(ensure_context_path(ctx), {})
+
+        return self.__hot.count(ctx, kind) + sum(
+            count
+            for spilled_kind, segments in spilled.items()
+            if kind is None or spilled_kind == kind
+            for _, _, count in segments
+        )
+
+    @property
+    def flat(self) -> list[MessageRecord]:
+        return list(self.iter())
+
+    def iter(
+        self,
+        kinds: Optional[Iterable[Kind]] = None,
+        ctx: Optional[str] = None,
+        prefix: Optional[str] = None,
+    ) -> Iterator[MessageRecord]:
+        kinds = None if kinds is None else tuple(kinds)
+        ctx = None if ctx is None else ensure_context_path(ctx)
+        prefix = None if prefix is None else ensure_context_path(prefix)
+        hot_store = self.__hot.store
+
+        for context_path in dict.fromkeys([*self.__index, *hot_store]):
+            if (ctx is not None and context_path != ctx) or (
+                prefix is not None
+                and context_path != prefix
+                and not context_path.startswith(f'{prefix}.')
+            ):
+                continue
+
+            spilled: SpillBuckets = self.__index.get(context_path, dict())
+            context_view = hot_store.get(context_path)
+            hot: Mapping[Kind, BucketView] = (
+                dict() if context_view is None else context_view
+            )
+            cell = ContextCell(context_path)
+            present: list[Kind] = [*spilled, *hot]
+
+            # [NOTE] Spilled messages of a bucket are older than those in memory
+            for kind in dict.fromkeys(present) if kinds is None else kinds:
+                for segment in spilled.get(kind, ()):
+                    for summary, description in self.__read(segment):
+                        yield make_record(cell, kind, summary, description)
+
+                yield from hot.get(kind, ())
+
+    def collect(self) -> Sack:
+        sack = Sack()
+        sack.add_many(
+            (
+                (context_path, (record.to_message() for record in records))
+                for context_path, records in groupby(self.iter(), itemgetter('ctx'))
+            ),
+            trusted=True,
+        )
+
+        return sack
+
+    def mount(self, mount_context_path: str) -> None:
+        mount_context_path = ensure_context_path(mount_context_path)
+
+        if mount_context_path == GLOBAL_CONTEXT_PATH:
+            return None
+
+        # [NOTE] Spilled messages hold no ctx, so only the index is moved
+        self.__index = {
+            rebase_context_path(mount_context_path, context_path): spilled
+            for context_path, spilled in self.__index.items()
+        }
+        self.__hot.mount(mount_context_path)
+
+    def add_messages(
+        self,
+        input_messages: Iterable[InputMessage],
+        context_path: Optional[str] = None,
+    ) -> None:
+        for batch in self.__batches(input_messages):
+            self.__hot.add_messages(batch, context_path)
+            self.__check_budget()
+
+    def add_many(self, context_messages: ContextMessages, trusted: bool = False) -> None:
+        for context_path, messages in context_pairs(context_messages):
+            for batch in self.__batches(messages):
+                self.__hot.add_many([cast(ContextPair, (context_path, batch))], trusted)
+                self.__check_budget()
+
+    def merge(
+        self,
+        other: Sack,
+        mount_context_path: Optional[str] = None,
+        consume: bool = False,
+    ) -> None:
+        mount_context_path = ensure_context_path(mount_context_path)
+
+        # [NOTE] Taken by reference, so the other sack is left empty like a plain merge
+        if consume:
+            taken = Sack()
+            taken.merge(other, consume=True)
+            other = taken
+
+        for context_path, context_view in other.store.items():
+            new_context_path = (
+                context_path
+                if mount_context_path == GLOBAL_CONTEXT_PATH
+                else f'{mount_context_path}.{context_path}'
+            )
+            records = (record for bucket in context_view.values() for record in bucket)
+
+            for batch in self.__batches(records):
+                self.__hot.add_records(batch, new_context_path)
+                self.__check_budget()
+
+    def spill(self) -> None:
+        hot, self.__hot = self.__hot, Sack()
+        fp = self.__file
+        fp.seek(0, SEEK_END)
+
+        for context_path, context_view in hot.store.items():
+            spilled = self.__index.setdefault(context_path, dict())
+
+            for kind, bucket in context_view.items():
+                offset = fp.tell()
+
+                for record in bucket:
+                    write_entry(fp, record.summary, record.description)
+
+                spilled.setdefault(kind, list()).append(
+                    (offset, fp.tell() - offset, len(bucket))
+                )
+                self.__counts[kind] = self.__counts.get(kind, 0) + len(bucket)
+                self.__size += len(bucket)
+
+        fp.flush()
+
+        # [NOTE] The file grew, so it is mapped again on the next read
+        if self.__map is not None:
+            self.__map.close()
+            self.__map = None
+
+    def close(self) -> None:
+        if self.__map is not None:
+            self.__map.close()
+            self.__map = None
+
+        self.__file.close()
+
+    def __check_budget(self) -> None:
+        if len(self.__hot) > self.memory_budget:
+            self.spill()
+
+    def __batches(self, items: Iterable[T]) -> Iterator[list[T]]:
+        iterator = iter(items)
+
+        # [NOTE] Batches fill the room left in memory, so spills also happen mid call
+        while batch := list(
+            islice(iterator, max(self.memory_budget - len(self.__hot), 1))
+        ):
+            yield batch
+
+    def __read(self, segment: Segment) -> Iterator[Entry]:
+        if self.__map is None:
+            self.__map = mmap(self.__file.fileno(), 0, access=ACCESS_READ)
+
+        offset, size, count = segment
+        reader = BinaryReader(BytesIO(self.__map[offset:offset + size]))
+
+        for _ in range(count):
+            yield reader.read_entry()
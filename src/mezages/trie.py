@@ -0,0 +1,82 @@
+from collections.abc import Iterator
+from typing import Generic, Optional, TypeVar
+
+
+T = TypeVar('T')
+
+
+class TrieNode(Generic[T]):
+    __slots__ = ('key', 'children', 'value')
+
+    def __init__(self, key: str) -> None:
+        self.key = key
+        self.children: dict[str, TrieNode[T]] = dict()
+        self.value: Optional[T] = None
+
+
+class ContextTrie(Generic[T]):
+    '''Index of context paths by their dot separated keys'''
+
+    def __init__(self) -> None:
+        self.root: TrieNode[T] = TrieNode('')
+
+    def insert(self, context_path: str, value: T) -> None:
+        node = self.root
+
+        for key in context_path.split('.'):
+            child = node.children.get(key)
+
+            if child is None:
+                child = node.children[key] = TrieNode(key)
+
+            node = child
+
+        node.value = value
+
+    def mount(self, context_path: str, root_key: str) -> None:
+        '''Nest every path under the given one, where the root key stands for it alone'''
+
+        root: TrieNode[T] = TrieNode('')
+        node = root
+
+        for key in context_path.split('.'):
+            child = node.children[key] = TrieNode[T](key)
+            node = child
+
+        # [NOTE] Existing nodes are moved as they are, so only the new path is walked
+        node.children = self.root.children
+        rooted = node.children.get(root_key)
+
+        if rooted is not None:
+            node.value, rooted.value = rooted.value, None
+
+            if not rooted.children:
+                del node.children[root_key]
+
+        self.root = root
+
+    def find(self, context_path: str) -> Optional[TrieNode[T]]:
+        node: Optional[TrieNode[T]] = self.root
+
+        for key in context_path.split('.'):
+            if node is None:
+                break
+            node = node.children.get(key)
+
+        return node
+
+    def values_under(self, context_path: str) -> Iterator[T]:
+        node = self.find(context_path)
+
+        if node is None:
+            return
+
+        stack = [node]
+
+        while stack:
+            node = stack.pop()
+
+            if node.value is not None:
+                yield node.value
+
+            stack.extend(reversed(node.children.values()))
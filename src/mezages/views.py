@@ -0,0 +1,94 @@
+from collections.abc import Iterator, Mapping, Sequence
+from typing import Any, cast, overload
+
+from mezages.lib import Kind, MessageRecord
+
+
+# -------------------------------------
+# READ-ONLY VIEWS
+# -------------------------------------
+
+
+class BucketView(Sequence[MessageRecord]):
+    '''Read-only view over the messages of a single kind bucket'''
+
+    __slots__ = ('_bucket',)
+
+    def __init__(self, bucket: Sequence[MessageRecord]) -> None:
+        self._bucket = bucket
+
+    @overload
+    def __getitem__(self, index: int) -> MessageRecord: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> tuple[MessageRecord, ...]: ...
+
+    def __getitem__(
+        self, index: int | slice
+    ) -> MessageRecord | tuple[MessageRecord, ...]:
+        if isinstance(index, slice):
+            return tuple(self._bucket[index])
+        return self._bucket[index]
+
+    def __iter__(self) -> Iterator[MessageRecord]:
+        return iter(self._bucket)
+
+    def __len__(self) -> int:
+        return len(self._bucket)
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Sequence) or isinstance(other, str):
+            return NotImplemented
+
+        sequence = cast(Sequence[Any], other)
+
+        return len(self) == len(sequence) and all(
+            first == second for first, second in zip(self, sequence)
+        )
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({list(self._bucket)!r})'
+
+
+class ContextView(Mapping[Kind, BucketView]):
+    '''Read-only view over the kind buckets of a single context'''
+
+    __slots__ = ('_context_store',)
+
+    def __init__(self, context_store: Mapping[Kind, Sequence[MessageRecord]]) -> None:
+        self._context_store = context_store
+
+    def __getitem__(self, kind: Kind) -> BucketView:
+        return BucketView(self._context_store[kind])
+
+    def __iter__(self) -> Iterator[Kind]:
+        return iter(self._context_store)
+
+    def __len__(self) -> int:
+        return len(self._context_store)
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({dict(self.items())!r})'
+
+
+class StoreView(Mapping[str, ContextView]):
+    '''Read-only view over every context of a sack store'''
+
+    __slots__ = ('_store',)
+
+    def __init__(
+        self, store: Mapping[str, Mapping[Kind, Sequence[MessageRecord]]]
+    ) -> None:
+        self._store = store
+
+    def __getitem__(self, context_path: str) -> ContextView:
+        return ContextView(self._store[context_path])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._store)
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({dict(self.items())!r})'
@@ -0,0 +1,108 @@
+from asyncio import gather, run, sleep
+
+from tests.base_case import BaseCase
+from mezages import Sack
+from mezages.lib import ScopeError
+from mezages.collector import collect, emit
+
+
+class TestCollect(BaseCase):
+    '''when collecting messages through scopes instead of passing a sack around'''
+
+    def setUp(self) -> None:
+        self.sack = Sack()
+
+    def test_nested_scopes_prefix_context_paths(self):
+        '''it adds emitted messages under the joined context path'''
+
+        async def validate_user() -> None:
+            async with collect('user'):
+                emit(['Invalid email'], 'email')
+                emit([{'kind': 'failure', 'summary': 'Missing user'}])
+
+        async def main() -> None:
+            async with collect(sack=self.sack):
+                emit(['Request received'])
+
+                async with collect('data'):
+                    await validate_user()
+
+                    self.assertEqual(self.sack.count_under('data'), 0)
+
+        run(main())
+
+        self.assertEqual(self.sack.count(ctx='global'), 1)
+        self.assertEqual(self.sack.count(ctx='data.user.email'), 1)
+        self.assertEqual(self.sack.count(ctx='data.user', kind='failure'), 1)
+
+    def test_concurrent_tasks_fold_into_parent(self):
+        '''it folds the buffer of each task scope into the parent scope'''
+
+        async def worker(index: int) -> None:
+            async with collect(f'item_{index}'):
+                for count in range(3):
+                    emit([f'Message {count}'])
+                    await sleep(0)
+
+        async def main() -> None:
+            async with collect('items', sack=self.sack):
+                await gather(*(worker(index) for index in range(5)))
+
+        run(main())
+
+        self.assertEqual(len(self.sack), 15)
+        self.assertEqual(self.sack.count_under('items'), 15)
+        self.assertEqual(
+            [message['summary'] for message in self.sack.iter(ctx='items.item_3')],
+            ['Message 0', 'Message 1', 'Message 2'],
+        )
+
+    def test_task_outliving_its_scope(self):
+        '''it sends late messages into the enclosing scope'''
+
+        with collect(sack=self.sack):
+            with collect('data') as scope:
+                pass
+
+            scope.emit(['Late message'])
+
+        self.assertEqual(self.sack.count(ctx='data'), 1)
+
+    def test_emit_without_scope(self):
+        '''it raises a scope error'''
+
+        with self.assertRaises(ScopeError):
+            emit(['Lost message'])
+
+    def test_nested_scope_rejects_malformed_message(self):
+        '''it raises from emit in nested scopes just like in root scopes'''
+
+        with collect(sack=self.sack):
+            with collect('data'):
+                with self.assertRaises(KeyError):
+                    emit([{'kind': 'failure'}])  # type: ignore
+
+                emit(['Valid message'])
+
+        self.assertEqual(len(self.sack), 1)
+
+    def test_keeps_emission_order_across_tasks(self):
+        '''it orders messages of interleaved tasks by when they were emitted'''
+
+        async def worker(index: int) -> None:
+            async with collect():
+                for count in range(2):
+                    emit([f'Message {index}.{count}'], 'shared')
+                    await sleep(0)
+
+        async def main() -> None:
+            async with collect(sack=self.sack):
+                async with collect('items'):
+                    await gather(worker(0), worker(1))
+
+        run(main())
+
+        self.assertEqual(
+            [message['summary'] for message in self.sack.iter_ordered()],
+            ['Message 0.0', 'Message 1.0', 'Message 0.1', 'Message 1.1'],
+        )
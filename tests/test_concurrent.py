@@ -0,0 +1,51 @@
+from threading import Barrier, Thread
+
+from tests.base_case import BaseCase
+from mezages.concurrent import ConcurrentSack
+
+
+class TestConcurrentSack(BaseCase):
+    '''when many threads write into a concurrent sack'''
+
+    def setUp(self) -> None:
+        self.sack = ConcurrentSack()
+        self.barrier = Barrier(4)
+
+        def produce(index: int) -> None:
+            self.barrier.wait()
+
+            for count in range(100):
+                self.sack.add_messages([f'Message {index}.{count}'], f'worker_{index}')
+
+            self.sack.add_many({None: [{'kind': 'failure', 'summary': f'Done {index}'}]})
+
+        threads = [Thread(target=produce, args=(index,)) for index in range(4)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+    def test_collect_combines_shards(self):
+        '''it returns a sack holding the messages of every thread'''
+
+        sack = self.sack.collect()
+
+        self.assertEqual(len(sack), 404)
+        self.assertEqual(len(self.sack), 404)
+        self.assertEqual(sack.count(kind='failure'), 4)
+        self.assertEqual(sack.count(ctx='worker_2'), 100)
+        self.assertEqual(
+            [message['summary'] for message in sack.iter(ctx='worker_1')][:2],
+            ['Message 1.0', 'Message 1.1'],
+        )
+
+    def test_drain_empties_shards(self):
+        '''it moves every message out of the shards'''
+
+        sack = self.sack.drain()
+
+        self.assertEqual(len(sack), 404)
+        self.assertEqual(len(self.sack), 0)
+        self.assertEqual(len(self.sack.collect()), 0)
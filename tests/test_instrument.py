@@ -0,0 +1,86 @@
+from typing import Any, cast
+
+from mezages import Sack
+from tests.base_case import BaseCase
+from mezages.instrument import InstrumentedSack, instrument, uninstrument
+
+
+class TestInstrument(BaseCase):
+    '''when a sack is instrumented'''
+
+    def setUp(self) -> None:
+        self.calls: list[tuple[Any, ...]] = list()
+        self.sack = Sack()
+        self.stats = instrument(
+            self.sack,
+            lambda operation, seconds, messages, sack: self.calls.append(
+                (operation, messages, sack)
+            ),
+        )
+
+        other = Sack()
+        other.add_messages(['Value was trimmed'])
+
+        self.sack.add_messages(['Value was trimmed', 'Value was rounded'], 'data')
+        self.sack.add_many({'data': [{'kind': 'failure', 'summary': 'Value is invalid'}]})
+        self.sack.merge(other, 'other')
+        self.sack.mount('root')
+        self.flat = self.sack.flat
+
+    def test_counts_and_times_operations(self):
+        '''it counts the calls and messages of every operation'''
+
+        operations = self.stats.operations
+
+        self.assertIsInstance(self.sack, InstrumentedSack)
+        self.assertEqual(operations['add_messages'].calls, 1)
+        self.assertEqual(operations['add_messages'].messages, 2)
+        self.assertEqual(operations['add_many'].messages, 1)
+        self.assertEqual(operations['merge'].messages, 1)
+        self.assertEqual(operations['mount'].calls, 1)
+        self.assertEqual(operations['flat'].calls, 1)
+        self.assertGreaterEqual(operations['merge'].seconds, 0)
+        self.assertEqual(len(self.flat), 4)
+        self.assertEqual(self.sack.count(ctx='root.other.global'), 1)
+
+    def test_calls_the_tracer(self):
+        '''it calls the tracer after every operation'''
+
+        self.assertEqual(
+            [call[:2] for call in self.calls],
+            [
+                ('add_messages', 2),
+                ('add_many', 1),
+                ('merge', 1),
+                ('mount', 0),
+                ('flat', 0),
+            ],
+        )
+        self.assertIs(self.calls[0][2], self.sack)
+
+    def test_report(self):
+        '''it reports the operations along with message count and byte estimates'''
+
+        report = cast(InstrumentedSack, self.sack).report()
+
+        self.assertEqual(report['messages'], 4)
+        self.assertGreater(report['bytes'], 0)
+        self.assertEqual(report['operations']['merge']['calls'], 1)
+
+    def test_uninstrument(self):
+        '''it swaps the plain sack back in, keeping its messages'''
+
+        uninstrument(self.sack)
+
+        self.assertIs(type(self.sack), Sack)
+        self.assertFalse(hasattr(self.sack, 'stats'))
+        self.assertEqual(len(self.sack), 4)
+
+    def test_rejects_subclasses(self):
+        '''it refuses to swap the class of a sack subclass'''
+
+        class CustomSack(Sack):
+            pass
+
+        with self.assertRaises(TypeError):
+            instrument(CustomSack())
@@ -1,5 +1,15 @@
 from tests.base_case import BaseCase
-from mezages.lib import build_message, ensure_context_path, ContextError
+from mezages.lib import (
+    ContextPathCache,
+    build_message,
+    join_context_path,
+    build_record,
+    ensure_context_path,
+    ContextError,
+    Template,
+    MessageRecord,
+    DescribedMessageRecord,
+)
 
 
 class TestEnsureContextPath(BaseCase):
@@ -30,6 +40,102 @@ class TestEnsureContextPath(BaseCase):
 
         self.assertEqual(str(error.exception), "Invalid context path: [1, 2]")
 
+    def test_repeated_context_path_is_interned(self):
+        '''it returns the same string object for equal context paths'''
+
+        first_path = ensure_context_path(''.join(['data.', 'email']))
+        second_path = ensure_context_path(''.join(['data.', 'email']))
+
+        self.assertIs(first_path, second_path)
+
+
+class TestJoinContextPath(BaseCase):
+    '''when extending a valid context path'''
+
+    def test_valid_extension(self):
+        '''it returns the joined and interned context path'''
+
+        path = join_context_path('data', 'user.email')
+
+        self.assertEqual(path, 'data.user.email')
+        self.assertIs(path, join_context_path('data', 'user.email'))
+
+    def test_invalid_extension(self):
+        '''it raises a context error naming the extension'''
+
+        with self.assertRaises(ContextError) as error:
+            join_context_path('data', 'user$')
+
+        self.assertEqual(str(error.exception), "Invalid context path: 'user$'")
+
+
+class TestContextPathCache(BaseCase):
+    '''when validating context paths through a cache'''
+
+    def setUp(self) -> None:
+        self.cache = ContextPathCache(maxsize=2)
+
+    def test_counts_hits_and_misses(self):
+        '''it reports a miss for new paths and a hit for known paths'''
+
+        self.assertEqual(self.cache.validate('data'), 'data')
+        self.assertEqual(self.cache.validate('data'), 'data')
+        self.assertIsNone(self.cache.validate('da$ta'))
+
+        info = self.cache.info()
+
+        self.assertEqual((info.hits, info.misses, info.currsize), (1, 2, 1))
+
+    def test_validates_extension_of_known_prefix(self):
+        '''it only accepts a valid last key after a known prefix'''
+
+        self.cache.validate('data')
+
+        self.assertEqual(self.cache.validate('data.email'), 'data.email')
+        self.assertIsNone(self.cache.validate('data.'))
+        self.assertIsNone(self.cache.validate('data.em.'))
+
+    def test_evicts_least_recently_used(self):
+        '''it stays within its bound by evicting the oldest path'''
+
+        self.cache.validate('first')
+        self.cache.validate('second')
+        self.cache.validate('first')
+        self.cache.validate('third')
+
+        self.assertEqual(self.cache.info().currsize, 2)
+
+        self.cache.validate('first')
+        self.cache.validate('second')
+
+        self.assertEqual(self.cache.info().hits, 2)
+
+    def test_stops_churning_without_hits(self):
+        '''it leaves misses out once it evicted without any hit in between'''
+
+        for path in ('first', 'second', 'third', 'fourth'):
+            self.assertEqual(self.cache.validate(path), path)
+
+        self.assertEqual(self.cache.validate('fourth'), 'fourth')
+        self.assertEqual(self.cache.info().hits, 0)
+
+        self.cache.validate('third')
+        self.cache.validate('fifth')
+
+        self.assertEqual(self.cache.validate('fifth'), 'fifth')
+        self.assertEqual(self.cache.info().hits, 2)
+
+    def test_extends_without_caching_the_extension(self):
+        '''it validates the extension and only remembers the joined path'''
+
+        self.assertEqual(self.cache.extend('data', 'email'), 'data.email')
+        self.assertIsNone(self.cache.extend('data', 'em$ail'))
+        self.assertEqual(self.cache.extend('data', 'email'), 'data.email')
+
+        info = self.cache.info()
+
+        self.assertEqual((info.hits, info.currsize), (1, 1))
+
 
 class TestBuildMessage(BaseCase):
     '''when creating a message from an input message'''
@@ -66,6 +172,21 @@ class TestBuildMessage(BaseCase):
             },
         )
 
+    def test_input_message_with_template(self):
+        '''it returns a dict with the formatted summary and description'''
+
+        message = build_message(
+            'some.context',
+            {
+                'summary': 'Value {} is invalid',
+                'description': 'Expected at most {}',
+                'params': [12, 10],
+            },
+        )
+
+        self.assertEqual(message['summary'], 'Value 12 is invalid')
+        self.assertEqual(message['description'], 'Expected at most 12')
+
     def test_input_message_with_description(self):
         '''it returns a dict with description and other expected entries'''
 
@@ -87,3 +208,115 @@ class TestBuildMessage(BaseCase):
                 'description': 'This is description',
             },
         )
+
+
+class TestBuildRecord(BaseCase):
+    '''when creating a message record from an input message'''
+
+    def test_with_string_input_message(self):
+        '''it returns a record that reads like the built message'''
+
+        record = build_record('some.context', 'This is a summary')
+
+        self.assertIsInstance(record, MessageRecord)
+        self.assertEqual(record, build_message('some.context', 'This is a summary'))
+
+    def test_with_template_input_message(self):
+        '''it defers formatting until the record is read and caches the result'''
+
+        record = build_record(
+            'some.context',
+            {
+                'summary': 'Value {value} is invalid',
+                'description': 'Expected at most {limit}',
+                'params': {'value': 12, 'limit': 10},
+            },
+        )
+
+        self.assertIsInstance(getattr(record, '_summary'), Template)
+
+        self.assertEqual(record.summary, 'Value 12 is invalid')
+        self.assertEqual(record['description'], 'Expected at most 10')
+        self.assertIs(record.summary, getattr(record, '_summary'))
+
+    def test_with_changed_template_params(self):
+        '''it renders the params as they were when the record was built'''
+
+        params = {'value': 12}
+        record = build_record(
+            'some.context', {'summary': 'Value {value} is invalid', 'params': params}
+        )
+        params['value'] = 13
+
+        self.assertEqual(record.summary, 'Value 12 is invalid')
+
+    def test_with_broken_template(self):
+        '''it raises for missing params right away, like building a message does'''
+
+        for summary, params, error in (
+            ('Value {missing} is invalid', {'value': 12}, KeyError),
+            ('Value {0} is over {1}', [12], IndexError),
+            ('Value {} is invalid', {'value': 12}, ValueError),
+        ):
+            input_message = {'summary': summary, 'params': params}
+
+            with self.assertRaises(error):
+                build_message('some.context', input_message)  # type: ignore
+
+            with self.assertRaises(error):
+                build_record('some.context', input_message)  # type: ignore
+
+        record = build_record(
+            'some.context',
+            {
+                'summary': 'Value {value.real} is over {limit[0]}',
+                'params': {'value': 12, 'limit': [10]},
+            },
+        )
+
+        self.assertEqual(record.summary, 'Value 12 is over 10')
+
+    def test_with_structured_input_message(self):
+        '''it returns a record with custom kind and description'''
+
+        input_message = {
+            'kind': 'warning',
+            'summary': 'This is a summary',
+            'description': 'This is description',
+        }
+
+        record = build_record('some.context', input_message)  # type: ignore
+        message = build_message('some.context', input_message)  # type: ignore
+
+        self.assertEqual(record.kind, 'warning')
+        self.assertEqual(record['description'], 'This is description')
+        self.assertEqual(record.to_message(), message)
+
+    def test_record_is_immutable(self):
+        '''it rejects item assignment and unknown keys'''
+
+        record = build_record('some.context', 'This is a summary')
+
+        with self.assertRaises(TypeError):
+            record['summary'] = 'Other summary'  # type: ignore
+
+        with self.assertRaises(AttributeError):
+            record.summary = 'Other summary'  # type: ignore
+
+        with self.assertRaises(KeyError):
+            record['other']
+
+        self.assertFalse(hasattr(record, '__dict__'))
+
+    def test_record_without_description_is_compact(self):
+        '''it only allocates a description slot when there is a description'''
+
+        record = build_record('some.context', {'summary': 'This is a summary'})
+        described_record = build_record(
+            'some.context', {'summary': 'This is a summary', 'description': 'Details'}
+        )
+
+        self.assertNotIsInstance(record, DescribedMessageRecord)
+        self.assertIsInstance(described_record, DescribedMessageRecord)
+        self.assertIsNone(record.description)
+        self.assertEqual(described_record.description, 'Details')
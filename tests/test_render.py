@@ -0,0 +1,117 @@
+from collections.abc import Mapping
+
+from mezages import Sack
+from mezages.lib import Kind, MessageRecord
+from tests.base_case import BaseCase
+from mezages.render import Formatter, Renderer, TextFormatter, PayloadFormatter
+
+
+class CountingFormatter(TextFormatter):
+    def __init__(self) -> None:
+        self.messages = 0
+        self.contexts: list[str] = list()
+
+    def format_message(self, record: MessageRecord) -> str:
+        self.messages += 1
+        return super().format_message(record)
+
+    def format_context(
+        self, context_path: str, rendered: Mapping[Kind, list[str]]
+    ) -> str:
+        self.contexts.append(context_path)
+        return super().format_context(context_path, rendered)
+
+
+class TestRenderer(BaseCase):
+    '''when rendering a sack that keeps growing'''
+
+    def setUp(self) -> None:
+        self.sack = Sack()
+        self.sack.add_messages(['Value was trimmed'], 'data.name')
+        self.sack.add_messages(
+            [
+                {
+                    'kind': 'failure',
+                    'summary': 'Value is invalid',
+                    'description': 'Too long',
+                }
+            ],
+            'data.email',
+        )
+
+        self.formatter = CountingFormatter()
+        self.renderer = Renderer(self.sack, self.formatter)
+        self.rendered = self.renderer.render()
+
+    def test_renders_contexts(self):
+        '''it renders one fragment per context'''
+
+        self.assertEqual(
+            self.rendered,
+            {
+                'data.name': 'data.name [notice] Value was trimmed',
+                'data.email': 'data.email [failure] Value is invalid: Too long',
+            },
+        )
+
+    def test_reuses_unchanged_contexts(self):
+        '''it only renders the new messages of the contexts that grew'''
+
+        self.sack.add_messages(['Value was rounded'], 'data.name')
+        self.formatter.contexts.clear()
+
+        rendered = self.renderer.render()
+
+        self.assertEqual(self.formatter.messages, 3)
+        self.assertEqual(self.formatter.contexts, ['data.name'])
+        self.assertEqual(
+            rendered['data.name'],
+            'data.name [notice] Value was trimmed\ndata.name [notice] Value was rounded',
+        )
+
+    def test_rerenders_after_mount(self):
+        '''it renders every context again once the sack was remounted'''
+
+        self.sack.mount('root')
+
+        rendered = self.renderer.render()
+
+        self.assertEqual(self.formatter.messages, 4)
+        self.assertEqual(list(rendered), ['root.data.name', 'root.data.email'])
+        self.assertTrue(rendered['root.data.name'].startswith('root.data.name [notice]'))
+
+
+class TestFormatter(BaseCase):
+    '''when subclassing the formatter base'''
+
+    def test_requires_both_methods(self):
+        '''it cannot be instantiated without implementing every format method'''
+
+        class PartialFormatter(Formatter[str, str]):
+            def format_message(self, record: MessageRecord) -> str:
+                return record.summary
+
+        with self.assertRaises(TypeError):
+            PartialFormatter()  # type: ignore
+
+
+class TestPayloadFormatter(BaseCase):
+    '''when rendering a sack into structured payloads'''
+
+    def test_renders_payloads(self):
+        '''it renders each context into a payload of messages by kind'''
+
+        sack = Sack()
+        sack.add_messages([{'kind': 'failure', 'summary': 'Value is invalid'}], 'data')
+
+        self.assertEqual(
+            Renderer(sack, PayloadFormatter()).render(),
+            {
+                'data': {
+                    'ctx': 'data',
+                    'messages': {
+                        'failure': [{'summary': 'Value is invalid', 'description': None}]
+                    },
+                }
+            },
+        )
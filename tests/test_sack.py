@@ -1,4 +1,14 @@
+import sys
+from os import environ, pathsep
+from subprocess import run
+from json import dumps as dumps_json, loads as loads_json
+from pickle import dumps, loads
+from typing import Any
+from operator import attrgetter
+
 from mezages import Sack
+from mezages.lib import ContextError, Template
+from mezages.views import StoreView
 from tests.base_case import BaseCase
 
 
@@ -14,19 +24,70 @@ class TestInit(BaseCase):
 class TestStore(BaseCase):
     '''when getting the store content of a sack'''
 
-    def test_returns_store_clone(self):
-        '''it returns the correct clone of the store'''
+    def setUp(self) -> None:
+        self.sack = Sack()
 
-        sack = Sack()
+        self.sack.add_messages(['First test message'], 'data')
+        self.sack.add_messages(
+            [{'kind': 'failure', 'summary': 'Second test message'}])
+
+    def test_returns_read_only_view(self):
+        '''it returns a view that reflects the store without copying it'''
+
+        store = self.sack.store
+        expected_store = getattr(self.sack, '_Sack__store')
+
+        self.assertIsInstance(store, StoreView)
+        self.assertEqual(store, expected_store)
+        self.assertIs(store['data']['notice'][0], expected_store['data']['notice'][0])
+
+    def test_view_cannot_change_store(self):
+        '''it does not expose any way to change the store internals'''
+
+        store = self.sack.store
+
+        with self.assertRaises(TypeError):
+            store['other'] = {}  # type: ignore
+
+        with self.assertRaises(TypeError):
+            store['data']['notice'][0] = 'Other message'  # type: ignore
+
+        with self.assertRaises(TypeError):
+            store['data']['notice'][0]['summary'] = 'Other message'  # type: ignore
+
+        self.assertNotIsInstance(store['data']['notice'][:], list)
 
+
+class TestSnapshot(BaseCase):
+    '''when taking a snapshot of the store content of a sack'''
+
+    def test_returns_detached_copy(self):
+        '''it returns plain dicts that are detached from the store'''
+
+        sack = Sack()
         sack.add_messages(['First test message'], 'data')
-        sack.add_messages(
-            [{'kind': 'failure', 'summary': 'Second test message'}])
 
-        expected_store = getattr(sack, '_Sack__store')
+        snapshot = sack.snapshot()
 
-        self.assertDictDeepEqual(sack.store, expected_store)
-        self.assertNotEqual(id(sack.store), id(expected_store))
+        self.assertDictDeepEqual(
+            snapshot,
+            {
+                'data': {
+                    'notice': [
+                        {
+                            'ctx': 'data',
+                            'kind': 'notice',
+                            'summary': 'First test message',
+                            'description': None,
+                        }
+                    ]
+                },
+            },
+        )
+
+        snapshot['data']['notice'][0]['summary'] = 'Changed message'
+
+        self.assertEqual(sack.store['data']['notice'][0]['summary'], 'First test message')
 
 
 class TestFlat(BaseCase):
@@ -59,6 +120,263 @@ class TestFlat(BaseCase):
             ],
         )
 
+    def test_exports_plain_messages(self):
+        '''it exports the messages as plain dicts that json can encode'''
+
+        sack = Sack()
+        sack.add_messages(['First test message'], 'data')
+
+        messages = sack.to_messages()
+
+        self.assertIs(type(messages[0]), dict)
+        self.assertEqual(
+            loads_json(dumps_json(messages)),
+            [
+                {
+                    'ctx': 'data',
+                    'kind': 'notice',
+                    'summary': 'First test message',
+                    'description': None,
+                }
+            ],
+        )
+
+
+class TestCounts(BaseCase):
+    '''when asking for message counts of a sack'''
+
+    def setUp(self) -> None:
+        self.sack = Sack()
+
+        self.sack.add_messages(['Global message'])
+        self.sack.add_messages(
+            ['Data message', {'kind': 'failure', 'summary': 'Data failure'}], 'data'
+        )
+
+    def test_counts_added_messages(self):
+        '''it keeps per-kind, per-context and total counts'''
+
+        self.assertEqual(len(Sack()), 0)
+        self.assertEqual(len(self.sack), 3)
+        self.assertEqual(dict(self.sack.counts), {'notice': 2, 'failure': 1})
+        self.assertTrue(self.sack.has('failure'))
+        self.assertFalse(self.sack.has('warning'))
+        self.assertEqual(self.sack.count(ctx='data'), 2)
+        self.assertEqual(self.sack.count(ctx='data', kind='failure'), 1)
+        self.assertEqual(self.sack.count(kind='notice'), 2)
+        self.assertEqual(self.sack.count(ctx='other'), 0)
+
+    def test_counts_are_read_only(self):
+        '''it does not allow the counts to be changed'''
+
+        with self.assertRaises(TypeError):
+            self.sack.counts['failure'] = 0  # type: ignore
+
+    def test_counts_after_mount_and_merge(self):
+        '''it stays consistent with the store'''
+
+        copied_sack = Sack()
+        copied_sack.add_messages([{'kind': 'warning', 'summary': 'Copied warning'}])
+
+        consumed_sack = Sack()
+        consumed_sack.add_messages(['Consumed message'], 'data')
+
+        self.sack.mount('form')
+        self.sack.merge(copied_sack, 'form')
+        self.sack.merge(consumed_sack, 'form', consume=True)
+
+        self.assertEqual(len(self.sack), 5)
+        self.assertEqual(len(copied_sack), 1)
+        self.assertEqual(len(consumed_sack), 0)
+        self.assertEqual(dict(consumed_sack.counts), {})
+        self.assertEqual(
+            dict(self.sack.counts), {'notice': 3, 'failure': 1, 'warning': 1}
+        )
+        self.assertEqual(self.sack.count(ctx='form.data'), 3)
+        self.assertEqual(self.sack.count_under('form'), 5)
+        self.assertEqual(len(self.sack), len(self.sack.flat))
+
+
+class TestIter(BaseCase):
+    '''when lazily iterating over the messages of a sack'''
+
+    def setUp(self) -> None:
+        self.sack = Sack()
+
+        self.sack.add_messages(['Global message'])
+        self.sack.add_messages(
+            ['Data message', {'kind': 'failure', 'summary': 'Data failure'}], 'data'
+        )
+        self.sack.add_messages(
+            [{'kind': 'warning', 'summary': 'Email warning'}], 'data.email'
+        )
+
+    def test_iterates_without_copies(self):
+        '''it yields the stored records themselves'''
+
+        messages = list(self.sack.iter())
+
+        self.assertEqual(len(messages), 4)
+        self.assertIs(messages[0], self.sack.store['global']['notice'][0])
+
+    def test_filters_by_kinds_ctx_and_prefix(self):
+        '''it only yields messages matching every given filter'''
+
+        def summaries(**filters: Any) -> list[str]:
+            return [message['summary'] for message in self.sack.iter(**filters)]
+
+        self.assertEqual(
+            summaries(kinds=['failure', 'warning']), ['Data failure', 'Email warning']
+        )
+        self.assertEqual(summaries(ctx='data'), ['Data message', 'Data failure'])
+        self.assertEqual(summaries(prefix='data', kinds=['warning']), ['Email warning'])
+        self.assertEqual(summaries(ctx='data.email', prefix='data'), ['Email warning'])
+        self.assertEqual(summaries(ctx='global', prefix='data'), [])
+        self.assertEqual(summaries(ctx='other'), [])
+
+    def test_first_and_any(self):
+        '''it stops at the first matching message'''
+
+        first_failure = self.sack.first('failure')
+
+        self.assertIsNotNone(first_failure)
+        self.assertEqual(first_failure and first_failure['summary'], 'Data failure')
+        self.assertIsNone(self.sack.first('failure', ctx='global'))
+
+        self.assertTrue(self.sack.any('warning'))
+        self.assertTrue(self.sack.any(prefix='data.email'))
+        self.assertFalse(self.sack.any('warning', prefix='global'))
+        self.assertFalse(Sack().any())
+
+    def test_rejects_invalid_prefix(self):
+        '''it raises a context error for an invalid prefix, with or without a ctx'''
+
+        with self.assertRaises(ContextError):
+            list(self.sack.iter(prefix='Bad$'))
+
+        with self.assertRaises(ContextError):
+            list(self.sack.iter(ctx='data', prefix='Bad$'))
+
+
+class TestIterOrdered(BaseCase):
+    '''when iterating over messages in the order they were emitted'''
+
+    def test_orders_across_contexts_and_kinds(self):
+        '''it streams messages of every bucket in emission order'''
+
+        sack = Sack()
+
+        sack.add_messages(['First', {'kind': 'failure', 'summary': 'Second'}], 'data')
+        sack.add_messages(['Third'])
+        sack.add_messages([{'kind': 'failure', 'summary': 'Fourth'}, 'Fifth'], 'data')
+
+        self.assertEqual(
+            [message['summary'] for message in sack.iter_ordered()],
+            ['First', 'Second', 'Third', 'Fourth', 'Fifth'],
+        )
+        self.assertEqual(
+            [message['summary'] for message in sack.iter_ordered(['notice'], 'data')],
+            ['First', 'Fifth'],
+        )
+
+    def test_interleaves_merged_sacks(self):
+        '''it interleaves merged messages with existing ones by sequence'''
+
+        first_sack, second_sack, third_sack = Sack(), Sack(), Sack()
+
+        first_sack.add_messages(['First'])
+        second_sack.add_messages(['Second'])
+        first_sack.add_messages(['Third'])
+        third_sack.add_messages(['Fourth'])
+        second_sack.add_messages(['Fifth'])
+        third_sack.add_messages(['Sixth'])
+
+        second_sack.merge(third_sack, consume=True)
+        first_sack.merge(second_sack)
+
+        self.assertEqual(
+            [message['summary'] for message in first_sack.flat],
+            ['First', 'Third', 'Second', 'Fifth', 'Fourth', 'Sixth'],
+        )
+        self.assertEqual(
+            [message['summary'] for message in first_sack.iter_ordered()],
+            ['First', 'Second', 'Third', 'Fourth', 'Fifth', 'Sixth'],
+        )
+
+    def test_orders_added_records(self):
+        '''it keeps emission order for records added out of sequence'''
+
+        first_sack, second_sack, sack = Sack(), Sack(), Sack()
+
+        first_sack.add_messages(['First'])
+        second_sack.add_messages(['Second'])
+        first_sack.add_messages(['Third'])
+        second_sack.add_messages(['Fourth'])
+        first_sack.merge(second_sack)
+
+        sack.add_records(first_sack.flat)
+        sack.add_records(reversed(first_sack.flat), 'data')
+
+        self.assertEqual(
+            [message['summary'] for message in sack.iter_ordered(ctx='global')],
+            ['First', 'Second', 'Third', 'Fourth'],
+        )
+        self.assertEqual(
+            [message['summary'] for message in sack.iter_ordered(ctx='data')],
+            ['First', 'Second', 'Third', 'Fourth'],
+        )
+
+
+class TestUnder(BaseCase):
+    '''when querying the messages under a context path'''
+
+    def setUp(self) -> None:
+        self.sack = Sack()
+
+        self.sack.add_messages(['Global message'])
+        self.sack.add_messages(['Data message'], 'data')
+        self.sack.add_messages(
+            ['Email message', {'kind': 'failure', 'summary': 'Email failure'}],
+            'data.user.email',
+        )
+        self.sack.add_messages(['Database message'], 'database')
+
+    def test_returns_messages_of_subtree(self):
+        '''it yields messages of the context and its descendants only'''
+
+        self.assertEqual(
+            [message['summary'] for message in self.sack.under('data')],
+            ['Data message', 'Email message', 'Email failure'],
+        )
+        self.assertEqual(self.sack.count_under('data'), 3)
+        self.assertEqual(self.sack.count_under('data.user'), 2)
+        self.assertEqual(self.sack.count_under('other'), 0)
+
+    def test_filters_by_kinds(self):
+        '''it only yields and counts messages of the given kinds'''
+
+        self.assertEqual(
+            [message['summary'] for message in self.sack.under('data', ['failure'])],
+            ['Email failure'],
+        )
+        self.assertEqual(self.sack.count_under('data', ['failure']), 1)
+
+    def test_follows_mount_and_merge(self):
+        '''it keeps the index in step with mounted and merged contexts'''
+
+        other_sack = Sack()
+        other_sack.add_messages(['Other message'], 'user')
+
+        self.sack.mount('form')
+        self.sack.merge(other_sack, 'form.data', consume=True)
+
+        self.assertEqual(self.sack.count_under('data'), 0)
+        self.assertEqual(self.sack.count_under('form'), 6)
+        self.assertEqual(
+            [message['ctx'] for message in self.sack.under('form.data.user')],
+            ['form.data.user', 'form.data.user.email', 'form.data.user.email'],
+        )
+
 
 class TestMount(BaseCase):
     '''when mounting each path in a sack on a mount path'''
@@ -77,7 +395,7 @@ class TestMount(BaseCase):
         self.sack.mount('global')
 
         self.assertDictDeepEqual(
-            self.sack.store,
+            self.sack.snapshot(),
             {
                 'global': {
                     'failure': [
@@ -108,7 +426,7 @@ class TestMount(BaseCase):
         self.sack.mount('test.mount')
 
         self.assertDictDeepEqual(
-            self.sack.store,
+            self.sack.snapshot(),
             {
                 'test.mount': {
                     'failure': [
@@ -133,6 +451,32 @@ class TestMount(BaseCase):
             },
         )
 
+    def test_mount_keeps_records_in_place(self):
+        '''it resolves the new ctx without rebuilding any record'''
+
+        record = self.sack.store['data']['notice'][0]
+
+        self.sack.mount('test')
+        self.sack.mount('outer')
+
+        self.assertIs(self.sack.store['outer.test.data']['notice'][0], record)
+        self.assertEqual(record['ctx'], 'outer.test.data')
+
+    def test_mount_after_merge(self):
+        '''it updates the ctx of merged messages too'''
+
+        other_sack = Sack()
+        other_sack.add_messages(['Other test message'])
+
+        self.sack.merge(other_sack, 'user')
+        self.sack.mount('test')
+
+        self.assertEqual(
+            [message['ctx'] for message in self.sack.store['test.user.global']['notice']],
+            ['test.user.global'],
+        )
+        self.assertEqual(other_sack.store['global']['notice'][0]['ctx'], 'global')
+
 
 class TestAddMessages(BaseCase):
     '''when adding one or more messages into a context'''
@@ -140,15 +484,29 @@ class TestAddMessages(BaseCase):
     def setUp(self) -> None:
         self.sack = Sack()
 
+    def test_add_no_messages(self) -> None:
+        '''it leaves no context behind when no message is stored'''
+
+        self.sack.add_messages([], 'data')
+        self.sack.add_many({'meta': []})
+
+        bounded_sack = Sack(max_per_context=0)
+        bounded_sack.add_messages(['Dropped message'], 'data')
+
+        self.assertEqual(self.sack.snapshot(), dict())
+        self.assertEqual(bounded_sack.snapshot(), dict())
+        self.assertEqual(self.sack, Sack())
+        self.assertEqual(bounded_sack.fingerprint, Sack().fingerprint)
+
     def test_add_string_message(self) -> None:
         '''it reshapes the string message and correctly add it into the store'''
 
-        self.assertEqual(self.sack.store, dict())
+        self.assertEqual(self.sack.snapshot(), dict())
 
         self.sack.add_messages(['First global message'])
 
         self.assertDictDeepEqual(
-            self.sack.store,
+            self.sack.snapshot(),
             {
                 'global': {
                     'notice': [
@@ -166,13 +524,13 @@ class TestAddMessages(BaseCase):
     def test_add_structured_message(self) -> None:
         '''it reshapes the structured message and correctly add it into the store'''
 
-        self.assertEqual(self.sack.store, dict())
+        self.assertEqual(self.sack.snapshot(), dict())
 
         self.sack.add_messages(
             [{'kind': 'failure', 'summary': 'Second global message'}])
 
         self.assertDictDeepEqual(
-            self.sack.store,
+            self.sack.snapshot(),
             {
                 'global': {
                     'failure': [
@@ -190,12 +548,12 @@ class TestAddMessages(BaseCase):
     def test_add_message_for_a_non_existing_context(self) -> None:
         '''it adds the context and adds the message into the right bucket under it'''
 
-        self.assertEqual(self.sack.store, dict())
+        self.assertEqual(self.sack.snapshot(), dict())
 
         self.sack.add_messages(['First global message'], 'some.context')
 
         self.assertDictDeepEqual(
-            self.sack.store,
+            self.sack.snapshot(),
             {
                 'some.context': {
                     'notice': [
@@ -213,7 +571,7 @@ class TestAddMessages(BaseCase):
     def test_add_message_for_an_existing_context(self) -> None:
         '''it appends the message into the right bucket under it'''
 
-        self.assertEqual(self.sack.store, dict())
+        self.assertEqual(self.sack.snapshot(), dict())
         self.sack.add_messages(['Existing context message'], 'some.context')
 
         self.sack.add_messages(['New context message'], 'some.context')
@@ -222,7 +580,7 @@ class TestAddMessages(BaseCase):
         )
 
         self.assertDictDeepEqual(
-            self.sack.store,
+            self.sack.snapshot(),
             {
                 'some.context': {
                     'notice': [
@@ -251,6 +609,182 @@ class TestAddMessages(BaseCase):
             },
         )
 
+    def test_add_template_message(self) -> None:
+        '''it keeps the template unformatted until the message is read'''
+
+        self.sack.add_messages(
+            [{'summary': 'Field {name} is required', 'params': {'name': 'email'}}],
+            'data',
+        )
+
+        other_sack = Sack()
+        other_sack.merge(self.sack, 'form')
+
+        record = other_sack.store['form.data']['notice'][0]
+
+        self.assertIsInstance(getattr(record, '_summary'), Template)
+        self.assertEqual(record['summary'], 'Field email is required')
+        self.assertEqual(
+            self.sack.snapshot()['data']['notice'][0]['summary'],
+            'Field email is required',
+        )
+
+
+class TestAddMany(BaseCase):
+    '''when adding messages for many contexts at once'''
+
+    def setUp(self) -> None:
+        self.sack = Sack()
+
+    def test_add_from_mapping_of_iterables(self) -> None:
+        '''it adds every context with its messages grouped by kind'''
+
+        self.sack.add_many(
+            {
+                None: (summary for summary in ['First global message']),
+                'data': [
+                    'First data message',
+                    {'kind': 'failure', 'summary': 'Data failure'},
+                    'Second data message',
+                ],
+            }
+        )
+
+        self.assertDictDeepEqual(
+            self.sack.snapshot(),
+            {
+                'global': {
+                    'notice': [
+                        {
+                            'ctx': 'global',
+                            'kind': 'notice',
+                            'summary': 'First global message',
+                            'description': None,
+                        }
+                    ]
+                },
+                'data': {
+                    'notice': [
+                        {
+                            'ctx': 'data',
+                            'kind': 'notice',
+                            'summary': 'First data message',
+                            'description': None,
+                        },
+                        {
+                            'ctx': 'data',
+                            'kind': 'notice',
+                            'summary': 'Second data message',
+                            'description': None,
+                        },
+                    ],
+                    'failure': [
+                        {
+                            'ctx': 'data',
+                            'kind': 'failure',
+                            'summary': 'Data failure',
+                            'description': None,
+                        }
+                    ],
+                },
+            },
+        )
+
+    def test_add_from_iterable_of_pairs(self) -> None:
+        '''it appends to existing buckets of repeated contexts'''
+
+        self.sack.add_many(
+            iter([('data', ['First data message']), ('data', ['Second data message'])])
+        )
+
+        self.assertEqual(
+            [message['summary'] for message in self.sack.store['data']['notice']],
+            ['First data message', 'Second data message'],
+        )
+
+    def test_add_trusted_messages(self) -> None:
+        '''it stores pre-built messages under the given context'''
+
+        self.sack.add_many(
+            {
+                'data': [
+                    {
+                        'ctx': 'data',
+                        'kind': 'warning',
+                        'summary': 'Trusted message',
+                        'description': 'Some details',
+                    }
+                ]
+            },
+            trusted=True,
+        )
+
+        self.assertEqual(
+            self.sack.store['data']['warning'][0],
+            {
+                'ctx': 'data',
+                'kind': 'warning',
+                'summary': 'Trusted message',
+                'description': 'Some details',
+            },
+        )
+
+    def test_add_with_invalid_context_path(self) -> None:
+        '''it raises a context error'''
+
+        with self.assertRaises(ContextError):
+            self.sack.add_many({'some$context': ['Some message']})
+
+
+class TestScope(BaseCase):
+    '''when adding messages through a scoped child view'''
+
+    def setUp(self) -> None:
+        self.sack = Sack()
+
+    def test_writes_into_parent_store(self) -> None:
+        '''it stores messages under the prefixed paths of the parent sack'''
+
+        user_scope = self.sack.scope('data.user')
+
+        user_scope.add_messages(['User message'])
+        user_scope.add_messages(['Email message'], 'email')
+        user_scope.scope('name').add_many({None: ['Name message'], 'first': ['First']})
+
+        self.assertEqual(
+            list(self.sack.store),
+            ['data.user', 'data.user.email', 'data.user.name', 'data.user.name.first'],
+        )
+        self.assertEqual(
+            self.sack.store['data.user.email']['notice'][0]['ctx'], 'data.user.email'
+        )
+
+    def test_matches_mount_and_merge(self) -> None:
+        '''it produces the same store as mounting and merging a child sack'''
+
+        child_sack = Sack()
+        child_sack.add_messages(['Global message'])
+        child_sack.add_messages(['Email message'], 'email')
+        child_sack.mount('data.user')
+
+        expected_sack = Sack()
+        expected_sack.merge(child_sack)
+
+        user_scope = self.sack.scope('data.user')
+        user_scope.add_messages(['Global message'], 'global')
+        user_scope.add_messages(['Email message'], 'email')
+
+        self.assertDictDeepEqual(self.sack.snapshot(), expected_sack.snapshot())
+
+    def test_invalid_paths(self) -> None:
+        '''it raises a context error for invalid prefixes and paths'''
+
+        with self.assertRaises(ContextError):
+            self.sack.scope('data$')
+
+        with self.assertRaises(ContextError):
+            self.sack.scope('data').add_messages(['Some message'], 'user$')
+
 
 class TestMerge(BaseCase):
     '''when merging another sack into the current one'''
@@ -268,7 +802,7 @@ class TestMerge(BaseCase):
         self.sack.merge(other_sack)
 
         self.assertDictDeepEqual(
-            self.sack.store,
+            self.sack.snapshot(),
             {
                 'global': {
                     'notice': [
@@ -300,7 +834,7 @@ class TestMerge(BaseCase):
         self.sack.merge(other_sack, 'user')
 
         self.assertDictDeepEqual(
-            self.sack.store,
+            self.sack.snapshot(),
             {
                 'global': {
                     'notice': [
@@ -315,7 +849,7 @@ class TestMerge(BaseCase):
                 'user.global': {
                     'notice': [
                         {
-                            'ctx': 'global',
+                            'ctx': 'user.global',
                             'kind': 'notice',
                             'summary': 'First test message',
                             'description': None,
@@ -323,7 +857,7 @@ class TestMerge(BaseCase):
                     ],
                     'failure': [
                         {
-                            'ctx': 'global',
+                            'ctx': 'user.global',
                             'kind': 'failure',
                             'summary': 'Second test message',
                             'description': None,
@@ -346,7 +880,7 @@ class TestMerge(BaseCase):
         self.sack.merge(other_sack)
 
         self.assertDictDeepEqual(
-            self.sack.store,
+            self.sack.snapshot(),
             {
                 'global': {
                     'notice': [
@@ -376,3 +910,612 @@ class TestMerge(BaseCase):
                 },
             },
         )
+
+    def test_merge_with_invalid_mount_context_path(self) -> None:
+        '''it raises a context error without changing the store'''
+
+        other_sack = Sack()
+        other_sack.add_messages(['First message'])
+
+        with self.assertRaises(ContextError):
+            self.sack.merge(other_sack, 'some$context')
+
+        self.assertEqual(list(self.sack.store), ['global'])
+
+    def test_merge_keeps_other_sack_intact(self) -> None:
+        '''it leaves the other sack untouched by later changes to this sack'''
+
+        other_sack = Sack()
+        other_sack.add_messages(['First message'])
+
+        self.sack.merge(other_sack, 'user')
+        self.sack.mount('test')
+
+        self.assertEqual(other_sack.store['global']['notice'][0]['ctx'], 'global')
+        self.assertEqual(
+            self.sack.store['test.user.global']['notice'][0]['ctx'], 'test.user.global'
+        )
+
+
+class TestConsumingMerge(BaseCase):
+    '''when merging another sack into the current one by consuming it'''
+
+    def setUp(self) -> None:
+        self.sack = Sack()
+        self.sack.add_messages(['Initial message'])
+
+        self.other_sack = Sack()
+        self.other_sack.add_messages(['First message'])
+        self.other_sack.add_messages(['Second message'], 'data')
+
+    def test_rejects_consuming_itself(self) -> None:
+        '''it refuses to consume itself and keeps every message'''
+
+        with self.assertRaises(ValueError):
+            self.sack.merge(self.sack, consume=True)
+
+        self.assertEqual(len(self.sack), 1)
+        self.assertEqual(self.sack.count(ctx='global'), 1)
+
+    def test_merges_itself_by_copy(self) -> None:
+        '''it copies its own messages when merging itself without consuming'''
+
+        self.sack.merge(self.sack, 'copy')
+        self.sack.merge(self.sack)
+
+        self.assertEqual(len(self.sack), 4)
+        self.assertEqual(self.sack.count(ctx='global'), 2)
+        self.assertEqual(self.sack.count(ctx='copy.global'), 2)
+
+        bounded_sack = Sack(max_per_context=3)
+        bounded_sack.add_messages(['First', 'Second'])
+        bounded_sack.merge(bounded_sack)
+
+        self.assertEqual(len(bounded_sack), 3)
+        self.assertEqual(bounded_sack.dropped, {'notice': 1})
+
+    def test_moves_buckets_by_reference(self) -> None:
+        '''it moves the buckets over and leaves the other sack empty'''
+
+        other_bucket = getattr(self.other_sack, '_Sack__store')['data']['notice']
+
+        self.sack.merge(self.other_sack, consume=True)
+
+        self.assertIs(getattr(self.sack, '_Sack__store')['data']['notice'], other_bucket)
+        self.assertEqual(self.other_sack.snapshot(), dict())
+
+        self.assertDictDeepEqual(
+            self.sack.snapshot(),
+            {
+                'global': {
+                    'notice': [
+                        {
+                            'ctx': 'global',
+                            'kind': 'notice',
+                            'summary': 'Initial message',
+                            'description': None,
+                        },
+                        {
+                            'ctx': 'global',
+                            'kind': 'notice',
+                            'summary': 'First message',
+                            'description': None,
+                        },
+                    ]
+                },
+                'data': {
+                    'notice': [
+                        {
+                            'ctx': 'data',
+                            'kind': 'notice',
+                            'summary': 'Second message',
+                            'description': None,
+                        }
+                    ]
+                },
+            },
+        )
+
+    def test_updates_ctx_lazily(self) -> None:
+        '''it resolves the ctx of moved messages to their new context'''
+
+        self.sack.merge(self.other_sack, 'user', consume=True)
+
+        self.assertEqual(self.sack.store['user.data']['notice'][0]['ctx'], 'user.data')
+        self.assertEqual(
+            self.sack.store['user.global']['notice'][0]['ctx'], 'user.global'
+        )
+
+        self.sack.mount('test')
+
+        self.assertEqual(
+            self.sack.store['test.user.data']['notice'][0]['ctx'], 'test.user.data'
+        )
+
+    def test_matches_copying_merge(self) -> None:
+        '''it produces the same store as a copying merge'''
+
+        copying_sack = Sack()
+        copying_sack.add_messages(['Initial message'])
+        copying_sack.merge(self.other_sack, 'user')
+
+        self.sack.merge(self.other_sack, 'user', consume=True)
+
+        self.assertDictDeepEqual(self.sack.snapshot(), copying_sack.snapshot())
+
+
+class TestBounded(BaseCase):
+    '''when adding messages into a bounded sack'''
+
+    def test_folds_identical_messages(self) -> None:
+        '''it keeps one entry per identical message with its occurrence count'''
+
+        sack = Sack(fold=True)
+
+        sack.add_messages(['Upstream failed'] * 1000, 'data')
+        sack.add_messages(['Upstream failed', 'Other message'], 'data')
+        sack.add_messages(['Upstream failed'])
+
+        self.assertEqual(len(sack), 3)
+        self.assertEqual(sack.folded, 1000)
+        self.assertEqual(sack.occurrences(sack.store['data']['notice'][0]), 1001)
+        self.assertEqual(sack.occurrences(sack.store['global']['notice'][0]), 1)
+
+    def test_caps_per_context_and_kind(self) -> None:
+        '''it drops messages over the caps and counts them'''
+
+        sack = Sack(max_per_context=2, max_per_kind=3)
+
+        sack.add_messages(['First', 'Second', 'Third'], 'data')
+        sack.add_messages([{'kind': 'failure', 'summary': 'Failure'}], 'data')
+        sack.add_messages(['Fourth', 'Fifth'], 'user')
+
+        self.assertEqual(sack.count(ctx='data'), 2)
+        self.assertEqual(sack.count(ctx='user'), 1)
+        self.assertEqual(dict(sack.dropped), {'notice': 2, 'failure': 1})
+
+    def test_applies_limits_to_merged_messages(self) -> None:
+        '''it admits merged messages under the same limits and folding'''
+
+        other_sack = Sack(fold=True)
+        other_sack.add_messages(['Repeated'] * 3, 'data')
+        other_sack.add_messages(['Another', 'Extra'], 'data')
+
+        sack = Sack(max_per_context=2, fold=True)
+        sack.add_messages(['Repeated'], 'data')
+        sack.merge(other_sack, consume=True)
+
+        self.assertEqual(
+            [message['summary'] for message in sack.iter(ctx='data')],
+            ['Repeated', 'Another'],
+        )
+        self.assertEqual(sack.occurrences(sack.store['data']['notice'][0]), 4)
+        self.assertEqual(sack.folded, 3)
+        self.assertEqual(dict(sack.dropped), {'notice': 1})
+
+
+class TestPickle(BaseCase):
+    '''when pickling a sack'''
+
+    def test_round_trip(self) -> None:
+        '''it restores the same store and counts from its packed form'''
+
+        sack = Sack()
+        sack.add_messages(['First message'])
+        sack.add_messages(
+            [{'kind': 'failure', 'summary': 'Failure', 'description': 'Details'}],
+            'data.user',
+        )
+
+        restored_sack = loads(dumps(sack))
+
+        self.assertIsInstance(restored_sack, Sack)
+        self.assertDictDeepEqual(restored_sack.snapshot(), sack.snapshot())
+        self.assertEqual(dict(restored_sack.counts), dict(sack.counts))
+
+    def test_round_trip_keeps_limits_and_order(self) -> None:
+        '''it restores the limits, occurrences and emission order of the sack'''
+
+        other_sack = Sack()
+        other_sack.add_messages(['Merged'], 'data')
+
+        sack = Sack(max_per_context=3, fold=True)
+        sack.add_messages(['Repeated', 'Repeated', 'First'], 'data')
+        sack.merge(other_sack)
+        sack.add_messages(['Dropped'], 'data')
+
+        restored_sack = loads(dumps(sack))
+
+        self.assertEqual(restored_sack.max_per_context, 3)
+        self.assertIsNone(restored_sack.max_per_kind)
+        self.assertTrue(restored_sack.fold)
+        self.assertEqual(dict(restored_sack.dropped), {'notice': 1})
+        self.assertEqual(restored_sack.folded, 1)
+        self.assertEqual(restored_sack.occurrences(sack.store['data']['notice'][0]), 2)
+        self.assertEqual(
+            [record.seq for record in restored_sack.iter_ordered()],
+            [record.seq for record in sack.iter_ordered()],
+        )
+
+        restored_sack.add_messages(['Repeated'], 'data')
+
+        self.assertEqual(restored_sack.occurrences(sack.store['data']['notice'][0]), 3)
+        self.assertEqual(len(restored_sack), 3)
+
+
+class TestGather(BaseCase):
+    '''when gathering many worker sacks into one'''
+
+    def setUp(self) -> None:
+        self.sacks: list[Sack] = list()
+
+        for index in range(5):
+            sack = Sack()
+            sack.add_messages([f'Message {index}'])
+            sack.add_messages([{'kind': 'failure', 'summary': 'Shared'}], 'shared')
+            self.sacks.append(sack)
+
+    def test_gathers_under_mount_paths(self) -> None:
+        '''it mounts each sack on its path and consumes it into the result'''
+
+        sack = Sack.gather(self.sacks, [f'item_{index}' for index in range(5)])
+
+        self.assertEqual(len(sack), 10)
+        self.assertEqual(sack.count_under('item_3'), 2)
+        self.assertEqual(sack.store['item_3']['notice'][0]['ctx'], 'item_3')
+        self.assertEqual(sum(len(worker_sack) for worker_sack in self.sacks), 0)
+
+    def test_keeps_emission_order(self) -> None:
+        '''it merges shared contexts while keeping emission order'''
+
+        sack = Sack.gather(self.sacks)
+
+        self.assertEqual(len(sack), 10)
+        self.assertEqual(sack.count(ctx='shared', kind='failure'), 5)
+        self.assertEqual(
+            [message['summary'] for message in sack.iter_ordered(['notice'])],
+            [f'Message {index}' for index in range(5)],
+        )
+
+    def test_ignores_limits_of_gathered_sacks(self) -> None:
+        '''it empties every sack without applying their limits to the others'''
+
+        sacks = [Sack(max_per_context=1) for _ in range(5)]
+
+        for sack in sacks:
+            sack.add_messages(['Value was trimmed'], 'data')
+
+        gathered = Sack.gather(sacks, [f'item_{index % 2}' for index in range(5)])
+
+        self.assertEqual(len(gathered), 5)
+        self.assertEqual(gathered.count(ctx='item_0.data'), 3)
+        self.assertEqual([len(sack) for sack in sacks], [0] * 5)
+
+
+class TestSince(BaseCase):
+    '''when polling a sack for messages added after a checkpoint'''
+
+    def setUp(self) -> None:
+        self.sack = Sack()
+        self.sack.add_messages(['Before'], 'data')
+        self.checkpoint = self.sack.checkpoint()
+
+    def summaries(self, checkpoint: int) -> list[str]:
+        return [message['summary'] for message in self.sack.since(checkpoint)]
+
+    def test_yields_added_and_merged(self) -> None:
+        '''it only yields messages added or merged after the checkpoint'''
+
+        other = Sack()
+        other.add_messages(['Merged'])
+
+        self.sack.add_messages(['First'], 'data')
+        self.sack.add_messages(['Second'], 'data')
+        self.sack.merge(other, 'other')
+        checkpoint = self.sack.checkpoint()
+        self.sack.add_messages(['Third'], 'data')
+
+        self.assertEqual(
+            self.summaries(self.checkpoint), ['First', 'Second', 'Merged', 'Third']
+        )
+        self.assertEqual(self.summaries(checkpoint), ['Third'])
+        self.assertEqual(self.summaries(self.sack.checkpoint()), [])
+
+    def test_yields_consumed(self) -> None:
+        '''it yields the buckets handed over by a consuming merge'''
+
+        other = Sack()
+        other.add_messages(['Consumed'], 'fresh')
+        other_checkpoint = other.checkpoint()
+
+        self.sack.merge(other, consume=True)
+
+        self.assertEqual(self.summaries(self.checkpoint), ['Consumed'])
+        self.assertEqual(list(other.since(other_checkpoint)), [])
+
+    def test_yields_everything_after_mount(self) -> None:
+        '''it yields every message once the sack was remounted'''
+
+        self.sack.add_messages(['After'])
+        self.sack.mount('root')
+
+        self.assertCountEqual(self.summaries(self.checkpoint), ['Before', 'After'])
+
+    def test_rejects_unknown_checkpoint(self) -> None:
+        '''it raises for checkpoints the sack never handed out'''
+
+        with self.assertRaises(ValueError):
+            self.sack.since(5)
+
+        with self.assertRaises(ValueError):
+            Sack().since(0)
+
+    def test_releases_checkpoints(self) -> None:
+        '''it drops the log entries no checkpoint in use can read anymore'''
+
+        self.sack.add_messages(['First'], 'data')
+        checkpoint = self.sack.checkpoint()
+        self.sack.add_messages(['Second'], 'user')
+
+        self.sack.release(self.checkpoint)
+
+        self.assertEqual(len(getattr(self.sack, '_Sack__log')), 1)
+        self.assertEqual(self.summaries(checkpoint), ['Second'])
+
+        with self.assertRaises(ValueError):
+            self.sack.since(self.checkpoint)
+
+        self.sack.release(checkpoint)
+        self.sack.add_messages(['Third'], 'data')
+
+        self.assertIsNone(getattr(self.sack, '_Sack__log'))
+        self.assertEqual(self.summaries(self.sack.checkpoint()), [])
+
+        with self.assertRaises(ValueError):
+            self.sack.release(checkpoint)
+
+    def test_keeps_checkpoints_handed_out_twice(self) -> None:
+        '''it keeps a checkpoint until every holder released it'''
+
+        checkpoint = self.sack.checkpoint()
+        self.sack.add_messages(['After'], 'data')
+
+        self.sack.release(checkpoint)
+
+        self.assertEqual(self.summaries(checkpoint), ['After'])
+
+
+class TestTree(BaseCase):
+    '''when exporting a sack as a nested tree'''
+
+    def setUp(self) -> None:
+        self.sack = Sack()
+        self.sack.add_messages(['Request was slow'])
+        self.sack.add_messages(
+            [{'kind': 'failure', 'summary': 'Invalid email'}], 'data.email'
+        )
+        self.sack.add_messages(['Name was trimmed'], 'data.name')
+        self.sack.add_messages([{'kind': 'failure', 'summary': 'Invalid data'}], 'data')
+
+    def test_builds_nested_tree(self) -> None:
+        '''it nests the buckets under their path segments'''
+
+        self.assertEqual(
+            self.sack.to_tree(render=attrgetter('summary')),
+            {
+                'global': {'notice': ['Request was slow']},
+                'data': {
+                    'failure': ['Invalid data'],
+                    'contexts': {
+                        'email': {'failure': ['Invalid email']},
+                        'name': {'notice': ['Name was trimmed']},
+                    },
+                },
+            },
+        )
+
+    def test_applies_depth_and_kinds(self) -> None:
+        '''it folds deeper contexts into the depth limit and skips other kinds'''
+
+        self.assertEqual(
+            self.sack.to_tree(1, ['failure'], attrgetter('summary')),
+            {'data': {'failure': ['Invalid data', 'Invalid email']}},
+        )
+
+    def test_renders_plain_messages(self) -> None:
+        '''it holds plain message dicts unless told how to render them'''
+
+        tree = self.sack.to_tree()
+
+        self.assertEqual(loads_json(dumps_json(tree)), tree)
+        self.assertEqual(
+            tree['global'],
+            {
+                'notice': [
+                    {
+                        'ctx': 'global',
+                        'kind': 'notice',
+                        'summary': 'Request was slow',
+                        'description': None,
+                    }
+                ]
+            },
+        )
+
+    def test_keeps_kinds_apart_from_contexts(self) -> None:
+        '''it nests child contexts apart, even when they are named like a kind'''
+
+        self.sack.add_messages(['Value is missing'], 'data.failure')
+
+        self.assertEqual(
+            self.sack.to_tree(render=attrgetter('summary'))['data'],
+            {
+                'failure': ['Invalid data'],
+                'contexts': {
+                    'email': {'failure': ['Invalid email']},
+                    'name': {'notice': ['Name was trimmed']},
+                    'failure': {'notice': ['Value is missing']},
+                },
+            },
+        )
+
+    def test_streams_buckets(self) -> None:
+        '''it yields path segments, kinds and read-only buckets in tree order'''
+
+        self.assertEqual(
+            [(keys, kind, len(bucket)) for keys, kind, bucket in self.sack.iter_tree()],
+            [
+                (('global',), 'notice', 1),
+                (('data',), 'failure', 1),
+                (('data', 'email'), 'failure', 1),
+                (('data', 'name'), 'notice', 1),
+            ],
+        )
+
+
+class TestSelect(BaseCase):
+    '''when selecting parts of a sack into new sacks'''
+
+    def setUp(self) -> None:
+        self.sack = Sack()
+        self.sack.add_messages(['Request was slow'])
+        self.sack.add_messages(
+            ['Name was trimmed', {'kind': 'failure', 'summary': 'Invalid name'}],
+            'data.name',
+        )
+        self.sack.add_messages([{'kind': 'failure', 'summary': 'Invalid id'}], 'meta.id')
+
+    def test_selects_kinds_under_prefix(self) -> None:
+        '''it shares the matching buckets with a new sack'''
+
+        selected = self.sack.select(['failure'], prefix='data')
+
+        self.assertEqual(len(selected), 1)
+        self.assertEqual(dict(selected.counts), {'failure': 1})
+        first = selected.first()
+
+        self.assertEqual(first and first['summary'], 'Invalid name')
+        self.assertIs(first, self.sack.first('failure', 'data.name'))
+
+    def test_partitions_by_depth(self) -> None:
+        '''it splits the sack by the leading segments of its context paths'''
+
+        partitions = self.sack.partition_by()
+
+        self.assertEqual(list(partitions), ['global', 'data', 'meta'])
+        self.assertEqual(len(partitions['data']), 2)
+        self.assertEqual(partitions['meta'].count(ctx='meta.id'), 1)
+
+    def test_copies_on_write(self) -> None:
+        '''it copies shared buckets before either sack changes them'''
+
+        partitions = self.sack.partition_by()
+        data = partitions['data']
+
+        data.add_messages(['Name was lowered'], 'data.name')
+        data.mount('request')
+        self.sack.mount('response')
+        self.sack.add_messages(['Id was rounded'], 'response.meta.id')
+
+        data_first = data.first()
+        sack_first = self.sack.first(ctx='response.data.name')
+        meta_first = partitions['meta'].first()
+
+        self.assertEqual(len(data), 3)
+        self.assertEqual(data_first and data_first['ctx'], 'request.data.name')
+        self.assertEqual(sack_first and sack_first['ctx'], 'response.data.name')
+        self.assertEqual(self.sack.count(ctx='response.data.name'), 2)
+        self.assertEqual(meta_first and meta_first['ctx'], 'meta.id')
+        self.assertEqual(len(partitions['meta']), 1)
+        self.assertEqual(len(self.sack), 5)
+
+
+class TestFingerprint(BaseCase):
+    '''when fingerprinting sack contents'''
+
+    def setUp(self) -> None:
+        self.sack = Sack()
+        self.sack.add_messages(['First', 'Second'], 'data')
+        self.sack.add_messages([{'kind': 'failure', 'summary': 'Invalid'}], 'meta')
+
+        self.other = Sack()
+        self.other.add_messages([{'kind': 'failure', 'summary': 'Invalid'}], 'meta')
+        self.other.add_messages(['First'], 'data')
+        self.other.add_messages(['Second'], 'data')
+
+    def test_ignores_order(self) -> None:
+        '''it gives the same fingerprint to the same messages added in any order'''
+
+        self.assertEqual(self.sack.fingerprint, self.other.fingerprint)
+        self.assertEqual(self.sack, self.other)
+
+    def test_follows_changes(self) -> None:
+        '''it changes with added, merged and remounted messages'''
+
+        fingerprints = {self.sack.fingerprint}
+
+        self.sack.add_messages(['Third'], 'data')
+        fingerprints.add(self.sack.fingerprint)
+
+        self.sack.merge(self.other, 'other')
+        fingerprints.add(self.sack.fingerprint)
+
+        self.sack.mount('root')
+        fingerprints.add(self.sack.fingerprint)
+
+        self.assertEqual(len(fingerprints), 4)
+        self.assertNotEqual(self.sack, self.other)
+
+    def test_matches_rebuilt_sack(self) -> None:
+        '''it matches a sack built from scratch with the same contents'''
+
+        self.sack.mount('root')
+        self.sack.merge(self.other, 'other', consume=True)
+
+        rebuilt = Sack()
+        rebuilt.add_many(
+            {
+                context_path: [
+                    record.to_message() for record in self.sack.iter(ctx=context_path)
+                ]
+                for context_path in self.sack.store
+            },
+            trusted=True,
+        )
+
+        self.assertEqual(rebuilt.fingerprint, self.sack.fingerprint)
+        self.assertEqual(rebuilt, self.sack)
+        self.assertEqual(self.other.fingerprint, Sack().fingerprint)
+
+    def test_stable_across_processes(self) -> None:
+        '''it gives the same fingerprint in processes with other hash seeds'''
+
+        script = (
+            'from mezages import Sack\n'
+            'sack = Sack()\n'
+            "sack.add_messages(['First', 'Second'], 'data')\n"
+            "sack.add_messages([{'kind': 'failure', 'summary': 'Invalid'}], 'meta')\n"
+            'print(sack.fingerprint)\n'
+        )
+        env = {**environ, 'PYTHONPATH': pathsep.join(sys.path)}
+
+        for seed in ('1', '2'):
+            result = run(
+                [sys.executable, '-c', script],
+                env={**env, 'PYTHONHASHSEED': seed},
+                capture_output=True,
+                check=True,
+                text=True,
+            )
+
+            self.assertEqual(int(result.stdout), self.sack.fingerprint)
+
+    def test_compares_bucket_order(self) -> None:
+        '''it still tells sacks apart when only the message order differs'''
+
+        reordered = Sack()
+        reordered.add_messages(['Second', 'First'], 'data')
+        reordered.add_messages([{'kind': 'failure', 'summary': 'Invalid'}], 'meta')
+
+        self.assertEqual(reordered.fingerprint, self.sack.fingerprint)
+        self.assertNotEqual(reordered, self.sack)
@@ -0,0 +1,111 @@
+from io import BytesIO
+from json import dumps, loads
+
+from tests.base_case import BaseCase
+from mezages import Sack
+from mezages.serial import SerialError
+
+
+class TestDumpAndLoad(BaseCase):
+    '''when streaming a sack out and back in'''
+
+    def setUp(self) -> None:
+        self.sack = Sack()
+
+        self.sack.add_messages(['Global message'])
+        self.sack.add_messages(
+            [
+                'Data message',
+                {'kind': 'failure', 'summary': 'Data failure', 'description': 'Détails'},
+                {'kind': 'failure', 'summary': 'x' * 300, 'description': ''},
+            ],
+            'data.user',
+        )
+
+    def round_trip(self, format: str) -> Sack:
+        fp = BytesIO()
+        self.sack.dump(fp, format)  # type: ignore
+        fp.seek(0)
+
+        return Sack.load(fp)
+
+    def test_json_round_trip(self):
+        '''it writes valid json and loads back the same store'''
+
+        fp = BytesIO()
+        self.sack.dump(fp)
+
+        self.assertEqual(loads(fp.getvalue()), [m.to_message() for m in self.sack.flat])
+        self.assertDictDeepEqual(self.round_trip('json').snapshot(), self.sack.snapshot())
+
+    def test_binary_round_trip(self):
+        '''it writes the binary format and loads back the same store'''
+
+        loaded_sack = self.round_trip('binary')
+
+        self.assertDictDeepEqual(loaded_sack.snapshot(), self.sack.snapshot())
+        self.assertEqual(dict(loaded_sack.counts), dict(self.sack.counts))
+
+    def test_empty_sack_round_trip(self):
+        '''it loads back an empty sack'''
+
+        self.sack = Sack()
+
+        self.assertEqual(len(self.round_trip('json')), 0)
+        self.assertEqual(len(self.round_trip('binary')), 0)
+
+    def test_truncated_binary_stream(self):
+        '''it raises a serial error'''
+
+        fp = BytesIO()
+        self.sack.dump(fp, 'binary')
+
+        with self.assertRaises(SerialError):
+            Sack.load(BytesIO(fp.getvalue()[:-5]))
+
+    def test_unknown_format(self):
+        '''it raises a serial error'''
+
+        with self.assertRaises(SerialError):
+            self.sack.dump(BytesIO(), 'xml')  # type: ignore
+
+    def test_json_arrays(self):
+        '''it loads compact and indented json arrays of messages'''
+
+        messages = self.sack.to_messages()
+
+        for payload in (dumps(messages), dumps(messages, indent=2)):
+            loaded_sack = Sack.load(BytesIO(payload.encode()))
+
+            self.assertDictDeepEqual(loaded_sack.snapshot(), self.sack.snapshot())
+
+    def test_invalid_json_streams(self):
+        '''it raises a serial error for broken json, messages and kinds'''
+
+        message = {'ctx': 'data', 'kind': 'notice', 'summary': 'Message'}
+
+        for payload in (
+            '[\n{"ctx": "data",\n',
+            dumps({'messages': [message]}, indent=2),
+            dumps([{**message, 'kind': 'debug'}]),
+            dumps([{'ctx': 'data', 'kind': 'notice'}]),
+            dumps([message, 'Message']),
+        ):
+            with self.assertRaises(SerialError):
+                Sack.load(BytesIO(payload.encode()))
+
+    def test_corrupt_binary_stream(self):
+        '''it raises a serial error for unknown table indexes and kinds'''
+
+        fp = BytesIO()
+        self.sack.dump(fp, 'binary')
+        payload = fp.getvalue()
+        bucket = payload.index(b'\x03\x00\x00')
+
+        for corrupt in (
+            payload[:bucket] + b'\x03\x09\x00' + payload[bucket + 3:],
+            payload.replace(b'notice', b'nutice'),
+            payload.replace('Détails'.encode(), b'D\xff\xfftails'),
+        ):
+            with self.assertRaises(SerialError):
+                Sack.load(BytesIO(corrupt))
@@ -0,0 +1,116 @@
+from collections.abc import Iterator
+
+from mezages import Sack
+from tests.base_case import BaseCase
+from mezages.spill import SpillSack
+
+
+class TestSpillSack(BaseCase):
+    '''when a sack outgrows its memory budget'''
+
+    def setUp(self) -> None:
+        self.sack = SpillSack(memory_budget=3)
+        self.sack.add_messages(['First', 'Second'], 'data')
+        self.sack.add_messages(
+            [{'kind': 'failure', 'summary': 'Invalid', 'description': 'Too long'}],
+            'data.email',
+        )
+        self.sack.add_messages(['Third'], 'data')
+        self.sack.add_messages(['Fourth'], 'data')
+
+    def tearDown(self) -> None:
+        self.sack.close()
+
+    def test_spills_to_disk(self):
+        '''it moves the messages over budget to disk and keeps counting them'''
+
+        self.assertEqual(self.sack.spilled, 4)
+        self.assertEqual(len(self.sack), 5)
+        self.assertEqual(self.sack.count(ctx='data'), 4)
+        self.assertEqual(self.sack.count(kind='failure'), 1)
+        self.assertEqual(dict(self.sack.counts), {'notice': 4, 'failure': 1})
+
+    def test_iterates_disk_then_memory(self):
+        '''it reads spilled messages back before the ones still in memory'''
+
+        self.assertEqual(
+            [(message['ctx'], message['summary']) for message in self.sack.iter()],
+            [
+                ('data', 'First'),
+                ('data', 'Second'),
+                ('data', 'Third'),
+                ('data', 'Fourth'),
+                ('data.email', 'Invalid'),
+            ],
+        )
+        self.assertEqual(
+            self.sack.flat[-1].to_message(),
+            {
+                'ctx': 'data.email',
+                'kind': 'failure',
+                'summary': 'Invalid',
+                'description': 'Too long',
+            },
+        )
+        self.assertEqual(len(list(self.sack.iter(['failure'], prefix='data'))), 1)
+
+    def test_mount_and_merge(self):
+        '''it mounts spilled and in-memory messages alike'''
+
+        other = Sack()
+        other.add_messages(['Merged'])
+
+        self.sack.merge(other, 'other')
+        self.sack.mount('root')
+
+        collected = self.sack.collect()
+
+        self.assertEqual(len(collected), 6)
+        self.assertEqual(collected.count(ctx='root.data'), 4)
+        self.assertEqual(collected.count(ctx='root.other.global'), 1)
+        self.assertEqual(
+            [message['summary'] for message in collected.iter(ctx='root.data')],
+            ['First', 'Second', 'Third', 'Fourth'],
+        )
+
+
+class TestSpillBatches(BaseCase):
+    '''when a single call brings more messages than the memory budget'''
+
+    def setUp(self) -> None:
+        self.sack = SpillSack(memory_budget=10)
+        self.held: list[int] = list()
+
+    def tearDown(self) -> None:
+        self.sack.close()
+
+    def messages(self, count: int) -> Iterator[str]:
+        for index in range(count):
+            self.held.append(len(self.sack) - self.sack.spilled)
+            yield f'Message {index}'
+
+    def test_spills_within_one_call(self):
+        '''it spills between batches instead of after the whole call'''
+
+        self.sack.add_messages(self.messages(100), 'data')
+
+        self.assertLessEqual(max(self.held), 11)
+        self.assertEqual(len(self.sack), 100)
+        self.assertGreaterEqual(self.sack.spilled, 90)
+        self.assertEqual(
+            [message['summary'] for message in self.sack.iter(ctx='data')],
+            [f'Message {index}' for index in range(100)],
+        )
+
+    def test_spills_within_one_merge(self):
+        '''it spills between batches of merged messages and consumes the other sack'''
+
+        other = Sack()
+        other.add_messages([f'Message {index}' for index in range(50)], 'data')
+
+        self.sack.merge(other, 'other', consume=True)
+
+        self.assertEqual(len(other), 0)
+        self.assertEqual(len(self.sack), 50)
+        self.assertLessEqual(len(self.sack) - self.sack.spilled, 10)
+        self.assertEqual(self.sack.count(ctx='other.data'), 50)
@@ -0,0 +1,57 @@
+from tests.base_case import BaseCase
+from mezages.trie import ContextTrie
+
+
+class TestContextTrie(BaseCase):
+    '''when indexing context paths in a trie'''
+
+    def setUp(self) -> None:
+        self.trie: ContextTrie[str] = ContextTrie()
+
+        self.trie.insert('data', 'data')
+        self.trie.insert('data.user.email', 'data.user.email')
+        self.trie.insert('data.user.name', 'data.user.name')
+        self.trie.insert('database', 'database')
+
+    def test_values_under_prefix(self):
+        '''it yields the values of the prefix and its descendants only'''
+
+        self.assertEqual(
+            list(self.trie.values_under('data')),
+            ['data', 'data.user.email', 'data.user.name'],
+        )
+        self.assertEqual(
+            list(self.trie.values_under('data.user')),
+            ['data.user.email', 'data.user.name'],
+        )
+
+    def test_values_under_unknown_prefix(self):
+        '''it yields nothing'''
+
+        self.assertEqual(list(self.trie.values_under('data.other')), [])
+        self.assertEqual(list(self.trie.values_under('other.data')), [])
+
+    def test_mount(self):
+        '''it nests every path under the mount path, the root key becoming the path'''
+
+        self.trie.insert('global', 'global')
+        self.trie.insert('global.meta', 'global.meta')
+
+        self.trie.mount('form.main', 'global')
+
+        self.assertEqual(
+            list(self.trie.values_under('form')),
+            [
+                'global',
+                'data',
+                'data.user.email',
+                'data.user.name',
+                'database',
+                'global.meta',
+            ],
+        )
+        self.assertEqual(
+            list(self.trie.values_under('form.main.data.user')),
+            ['data.user.email', 'data.user.name'],
+        )
+        self.assertEqual(list(self.trie.values_under('data')), [])